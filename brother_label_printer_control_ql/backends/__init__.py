@@ -1,8 +1,12 @@
+from __future__ import annotations
+
+import re
+import time
 from enum import Enum
+from functools import cached_property
 from typing import Type
 
 from .abstract import BaseBrotherQLBackend, logger
-from .pyusb import BrotherQLBackendPyUSB
 
 
 class Backend(Enum):
@@ -10,8 +14,9 @@ class Backend(Enum):
     NETWORK = "network"
     LINUX_KERNEL = "linux_kernel"
 
-    @property
+    @cached_property
     def printer(self) -> Type[BaseBrotherQLBackend]:
+        """The backend class, the module is imported on first access."""
         match self:
             case Backend.PYUSB:
                 from . import pyusb as pyusb_backend
@@ -27,7 +32,20 @@ class Backend(Enum):
                 return linux_kernel_backend.BrotherQLBackendLinuxKernel
 
     def discover(self) -> list[str]:
-        return self.printer.list_available_devices()
+        """List the available devices, reusing the result of a discovery within the last few seconds."""
+        now = time.monotonic()
+        entry = _discover_cache.get(self)
+        if entry and now - entry[0] < _DISCOVER_TTL:
+            return list(entry[1])
+
+        self.printer.invalidate_device_cache()
+        devices = self.printer.list_available_devices()
+        _discover_cache[self] = (now, devices)
+        return list(devices)
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        _discover_cache.clear()
 
     @staticmethod
     def all() -> list[str]:
@@ -35,11 +53,22 @@ class Backend(Enum):
 
     @staticmethod
     def detect(identifier: str) -> "Backend":
-        if identifier.startswith("usb://") or identifier.startswith("0x"):
-            return Backend.PYUSB
-        elif identifier.startswith("file://") or identifier.startswith("/dev/usb/") or identifier.startswith("lp"):
-            return Backend.LINUX_KERNEL
-        elif identifier.startswith("tcp://"):
-            return Backend.NETWORK
-        else:
+        match = _PREFIX_RE.match(identifier)
+        if not match:
             raise ValueError(f"Cannot Detect the Backend for identifier: {identifier}")
+        return _PREFIX_MAP[match.group(0)]
+
+
+_PREFIX_MAP = {
+    "usb://": Backend.PYUSB,
+    "0x": Backend.PYUSB,
+    "file://": Backend.LINUX_KERNEL,
+    "/dev/usb/": Backend.LINUX_KERNEL,
+    "lp": Backend.LINUX_KERNEL,
+    "tcp://": Backend.NETWORK,
+}
+_PREFIX_RE = re.compile("|".join(map(re.escape, _PREFIX_MAP)))
+
+
+_DISCOVER_TTL = 5.0
+_discover_cache: dict[Backend, tuple[float, list[str]]] = {}
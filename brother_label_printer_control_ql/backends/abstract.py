@@ -1,5 +1,11 @@
+import asyncio
 import logging
+import queue
+import selectors
+import socket
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from builtins import bytes
 
@@ -7,12 +13,61 @@ from ..control.constants import RespPhaseTypes, RespStatusTypes
 from ..control.outcome import PrintOutcome
 from ..control.response import PrinterResponse
 from ..control.status import SendStatus
+from ..utils.buffers import total_length
 
 logger = logging.getLogger(__name__)
 
+_PRINTING_COMPLETED = RespStatusTypes.PRINTING_COMPLETED
+_PHASE_CHANGE = RespStatusTypes.PHASE_CHANGE
+_WAITING_TO_RECEIVE = RespPhaseTypes.WAITING_TO_RECEIVE
+
+
+def _reader_loop(backend_ref: weakref.ref, rx_queue: queue.Queue, stop: threading.Event, poll_interval: float) -> None:
+    """
+    Body of the status reader thread: moves raw responses from the device into the queue.
+    Only holds a weak reference, so the thread never keeps an otherwise unused backend alive.
+    """
+    while not stop.is_set():
+        backend = backend_ref()
+        if backend is None:
+            return
+        try:
+            data = backend._wait_and_read(poll_interval)
+        except Exception as e:
+            # hand the error to the waiting sender
+            _put_latest(rx_queue, e)
+            return
+        finally:
+            del backend
+        if data:
+            _put_latest(rx_queue, data)
+
+
+def _put_latest(rx_queue: queue.Queue, item) -> None:
+    """Enqueue without blocking, dropping the oldest entry if nobody consumed the queue."""
+    while True:
+        try:
+            rx_queue.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                rx_queue.get_nowait()
+            except queue.Empty:
+                pass
+
 
 class BaseBrotherQLBackend(ABC):
 
+    _selector: selectors.BaseSelector | None = None
+    # selector of the reader thread, waits for the device and for the wakeup socket
+    _rx_selector: selectors.BaseSelector | None = None
+    _rx_wakeup: tuple[socket.socket, socket.socket] | None = None
+    _finalizer: weakref.finalize | None = None
+    _rx_thread: threading.Thread | None = None
+
+    RX_QUEUE_SIZE = 64
+    RX_POLL_INTERVAL = 0.1
+
     @abstractmethod
     def __init__(self, device_specifier: str = None) -> None:
         pass
@@ -25,77 +80,269 @@ class BaseBrotherQLBackend(ABC):
     def _write(self, data: bytes) -> None:
         pass
 
-    @abstractmethod
-    def _dispose(self) -> None:
-        pass
+    def _selectable(self):
+        """
+        The object (socket or file descriptor) to wait on for incoming data,
+        or None if the backend cannot be used with a selector.
+        """
+        return None
+
+    def _read_nowait(self, length: int = 32) -> bytes:
+        """A single read, only called once the selector reported data to be available."""
+        return self._read(length)
+
+    def _wait_and_read(self, timeout: float, length: int = 32) -> bytes:
+        """
+        Block until data arrives or the timeout expires.
+
+        Backends without a selectable handle fall back to their own (timeout bounded) read.
+        """
+        selectable = self._selectable()
+        if selectable is None:
+            return self.read(length)
+
+        if self._rx_selector is None:
+            self._rx_selector = selectors.DefaultSelector()
+            self._rx_selector.register(selectable, selectors.EVENT_READ)
+            # _stop_reader() writes to this pair of sockets, so that the thread doesn't wait for the timeout to stop
+            self._rx_wakeup = socket.socketpair()
+            for sock in self._rx_wakeup:
+                sock.setblocking(False)
+            self._rx_selector.register(self._rx_wakeup[0], selectors.EVENT_READ)
+
+        events = self._rx_selector.select(timeout)
+        if not any(key.fileobj is selectable for key, _ in events):
+            return b""
+
+        ret_bytes = self._read_nowait(length)
+        if ret_bytes and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Read %d bytes.", len(ret_bytes))
+        return ret_bytes
 
     def read(self, length: int = 32) -> bytes:
         try:
             ret_bytes = self._read(length)
-            if ret_bytes:
+            if ret_bytes and logger.isEnabledFor(logging.DEBUG):
                 logger.debug("Read %d bytes.", len(ret_bytes))
             return ret_bytes
         except Exception as e:
             logger.debug("Error reading... %s", e)
             raise
 
-    def write(self, data: bytes) -> None:
-        logger.debug("Writing %d bytes.", len(data))
-        self._write(data)
+    def write(self, data: bytes | list[bytes]) -> None:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            logger.debug("Writing %d bytes.", len(data))
+            self._write(data)
+        else:
+            logger.debug("Writing %d bytes in %d parts.", total_length(data), len(data))
+            self._write_many(data)
 
-    def dispose(self) -> None:
+    def _write_many(self, parts: list[bytes]) -> None:
+        """Write several buffers in order. Backends supporting vectored I/O submit them at once."""
+        for part in parts:
+            self._write(part)
+
+    def _start_reader(self) -> None:
+        """Start the thread reading the responses of the printer, unless it is already running."""
+        if self._rx_thread is not None:
+            return
+        self._rx_queue = queue.Queue(maxsize=self.RX_QUEUE_SIZE)
+        self._rx_stop = threading.Event()
+        self._rx_thread = threading.Thread(
+            target=_reader_loop,
+            args=(weakref.ref(self), self._rx_queue, self._rx_stop, self.RX_POLL_INTERVAL),
+            name=f"{type(self).__name__}-reader",
+            daemon=True,
+        )
+        self._rx_thread.start()
+
+    def _stop_reader(self) -> None:
+        if self._rx_thread is None:
+            return
+        self._rx_stop.set()
+        if self._rx_wakeup is not None:
+            self._rx_wakeup[1].send(b"\0")
+        if self._rx_thread is not threading.current_thread():
+            self._rx_thread.join()
+        self._rx_thread = None
+        if self._rx_wakeup is not None:
+            # discard the wakeup, the next reader would return from its first wait at once otherwise
+            try:
+                while self._rx_wakeup[0].recv(64):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def _discard_pending(self) -> None:
+        """Drop the responses the device sent since the last job, before the reader thread is started."""
+        if self._selectable() is None:
+            # without a selector this would be a timeout bounded read before every job
+            return
+        for _ in range(self.RX_QUEUE_SIZE):
+            if not self._wait_and_read(0):
+                return
+
+    def _discard_received(self) -> None:
+        """Drop the responses queued so far, they don't belong to the job about to be sent."""
+        while True:
+            try:
+                self._rx_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _receive(self, timeout: float) -> bytes:
+        """The next response collected by the reader thread, or b"" if none arrived within the timeout."""
         try:
-            self._dispose()
-        except NotImplementedError:
-            pass
+            data = self._rx_queue.get(timeout=timeout)
+        except queue.Empty:
+            return b""
+        if isinstance(data, Exception):
+            self._rx_thread = None
+            raise data
+        return data
+
+    def dispose(self) -> None:
+        """
+        Release the device handle. Safe to call more than once.
+
+        Backends register the release of their resources with `weakref.finalize`,
+        so a backend that is never disposed explicitly is cleaned up once it is garbage collected.
+        """
+        self._stop_reader()
+        if self._rx_selector is not None:
+            self._rx_selector.close()
+            self._rx_selector = None
+        if self._rx_wakeup is not None:
+            for sock in self._rx_wakeup:
+                sock.close()
+            self._rx_wakeup = None
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._finalizer is not None:
+            self._finalizer()
 
-    def __del__(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
         self.dispose()
 
-    def send(self, instructions: bytes, blocking: bool = True) -> SendStatus:
+    def send(self, instructions: bytes | list[bytes], blocking: bool = True) -> SendStatus:
         """
         Send instruction bytes to a printer.
 
-        :param bytes instructions: The instructions to be sent to the printer.
+        :param bytes instructions: The instructions to be sent to the printer (or a list of consecutive parts of them).
         :param bool blocking: Indicates whether the function call should block while waiting for the completion of the printing.
         """
         status = SendStatus()
 
-        start = time.time()
-        logger.info("Sending instructions to the printer. Total: %d bytes.", len(instructions))
-        self.write(instructions)
+        # Responses are read by a dedicated thread; writes stay on the calling thread.
+        # The thread only runs during this call and anything left over from an earlier job is dropped first,
+        # so no response can be credited to the wrong job.
+        self._discard_pending()
+        self._start_reader()
+        self._discard_received()
+        try:
+            start = time.monotonic_ns()
+            logger.info("Sending instructions to the printer. Total: %d bytes.", total_length(instructions))
+            self.write(instructions)
+            status.outcome = PrintOutcome.SENT
+
+            if not blocking:
+                return status
+
+            deadline = start + 10_000_000_000
+            while (now := time.monotonic_ns()) < deadline:
+                data = self._receive((deadline - now) / 1e9)
+                if data and self._handle_response(status, data, start):
+                    break
+        finally:
+            self._stop_reader()
+
+        status.log_status(logger)
+        return status
+
+    async def send_async(self, instructions: bytes | list[bytes], blocking: bool = True) -> SendStatus:
+        """
+        Send instruction bytes to a printer without blocking the event loop.
+
+        :param bytes instructions: The instructions to be sent to the printer (or a list of consecutive parts of them).
+        :param bool blocking: Indicates whether the coroutine should wait for the completion of the printing.
+        """
+        status = SendStatus()
+
+        # The event loop does the reading here, it must not compete with the reader thread of send()
+        self._stop_reader()
+
+        start = time.monotonic_ns()
+        logger.info("Sending instructions to the printer. Total: %d bytes.", total_length(instructions))
+        await self._write_async(instructions)
         status.outcome = PrintOutcome.SENT
 
         if not blocking:
             return status
 
-        while time.time() - start < 10:
-            data = self.read()
-            if not data:
-                time.sleep(0.005)
-                continue
-            try:
-                result = PrinterResponse.from_bytes(data, logger)
-            except ValueError:
-                logger.error("TIME %.3f - Couldn't understand response: %s", time.time() - start, data)
-                continue
-            status.printer_state = result
-            logger.debug("TIME %.3f - result: %s", time.time() - start, result)
-            if result.errors:
-                logger.error("Errors occurred: %s", result.errors)
-                status.outcome = PrintOutcome.ERROR
-                break
-            if result.status_type == RespStatusTypes.PRINTING_COMPLETED:
-                status.did_print = True
-                status.outcome = PrintOutcome.PRINTED
-            if result.status_type == RespStatusTypes.PHASE_CHANGE and result.phase_type == RespPhaseTypes.WAITING_TO_RECEIVE:
-                status.ready_for_next_job = True
-            if status.did_print and status.ready_for_next_job:
-                break
+        async def receive() -> None:
+            while True:
+                data = await self._read_async()
+                if not data:
+                    # nothing arrived within the read timeout, don't spin on the event loop
+                    await asyncio.sleep(self.RX_POLL_INTERVAL)
+                    continue
+                if self._handle_response(status, data, start):
+                    return
+
+        try:
+            await asyncio.wait_for(receive(), timeout=10)
+        except asyncio.TimeoutError:
+            pass
 
         status.log_status(logger)
         return status
 
+    async def _read_async(self, length: int = 32) -> bytes:
+        """Awaitable read. Defaults to running the blocking read in the loop's executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.read, length)
+
+    async def _write_async(self, data: bytes | list[bytes]) -> None:
+        """Awaitable write. Defaults to running the blocking write in the loop's executor."""
+        await asyncio.get_running_loop().run_in_executor(None, self.write, data)
+
+    @staticmethod
+    def _handle_response(status: SendStatus, data: bytes, start: int) -> bool:
+        """
+        Update the send status with a response received from the printer.
+
+        start: time.monotonic_ns() at which the instructions were sent.
+        returns: True if no further responses need to be awaited.
+        """
+        try:
+            result = PrinterResponse.from_bytes(data, logger)
+        except ValueError:
+            logger.error("TIME %.3f - Couldn't understand response: %s", (time.monotonic_ns() - start) / 1e9, data)
+            return False
+        status.printer_state = result
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TIME %.3f - result: %s", (time.monotonic_ns() - start) / 1e9, result)
+        if result.errors:
+            logger.error("Errors occurred: %s", result.errors)
+            status.outcome = PrintOutcome.ERROR
+            return True
+        status_type = result.status_type
+        if status_type is _PHASE_CHANGE:
+            if result.phase_type is _WAITING_TO_RECEIVE:
+                status.ready_for_next_job = True
+        elif status_type is _PRINTING_COMPLETED:
+            status.did_print = True
+            status.outcome = PrintOutcome.PRINTED
+        return status.did_print and status.ready_for_next_job
+
+    @staticmethod
+    def invalidate_device_cache() -> None:
+        """Drop any enumeration results the backend keeps between calls to `list_available_devices`."""
+        pass
+
     @staticmethod
     @abstractmethod
     def list_available_devices() -> list[str]:
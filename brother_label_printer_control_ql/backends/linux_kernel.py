@@ -3,14 +3,17 @@ Backend to support Brother QL-series printers via the linux kernel USB printer i
 Works on Linux.
 """
 
+import asyncio
 import glob
 import os
 import time
+import weakref
 
 import select
 
 from .abstract import BaseBrotherQLBackend
-from .strategies import RetryStrategy
+from .retry_strategies import RetryStrategy
+from ..utils.buffers import IOV_MAX, as_views, consume
 
 
 class BrotherQLBackendLinuxKernel(BaseBrotherQLBackend):
@@ -20,6 +23,7 @@ class BrotherQLBackendLinuxKernel(BaseBrotherQLBackend):
 
     RETRY_STRATEGY = RetryStrategy.SELECT
     READ_TIMEOUT = 0.01
+    RX_BUFFER_SIZE = 4096
 
     def __init__(self, device_specifier: str) -> None:
         """
@@ -29,39 +33,71 @@ class BrotherQLBackendLinuxKernel(BaseBrotherQLBackend):
         self.dev = BrotherQLBackendLinuxKernel.get_device(device_specifier)
         self.write_dev = self.dev
         self.read_dev = self.dev
+        self._rx_buf = memoryview(bytearray(self.RX_BUFFER_SIZE))
+        self._finalizer = weakref.finalize(self, os.close, self.dev)
+
+    def _os_read(self, length: int) -> bytes:
+        """Read into the preallocated receive buffer instead of letting os.read() allocate one per call."""
+        n = os.readv(self.read_dev, (self._rx_buf[: min(length, self.RX_BUFFER_SIZE)],))
+        return bytes(self._rx_buf[:n])
 
     def _read(self, length: int = 32) -> bytes:
         match self.RETRY_STRATEGY:
             case RetryStrategy.TRY_TWICE:
-                data = os.read(self.read_dev, length)
+                data = self._os_read(length)
                 if data:
                     return data
                 else:
                     time.sleep(self.READ_TIMEOUT)
-                    return os.read(self.read_dev, length)
+                    return self._os_read(length)
             case RetryStrategy.SELECT:
-                data = b""
-                start = time.time()
-                while (not data) and (time.time() - start < self.READ_TIMEOUT):
-                    result, _, _ = select.select([self.read_dev], [], [], 0)
-                    if self.read_dev in result:
-                        data += os.read(self.read_dev, length)
-                    if data:
+                # Let the kernel block until data arrives or the timeout expires
+                start = time.monotonic()
+                remaining = self.READ_TIMEOUT
+                while remaining > 0:
+                    result, _, _ = select.select([self.read_dev], [], [], remaining)
+                    if not result:
                         break
-                    time.sleep(0.001)
-                if not data:
-                    # one last try if still no data:
-                    return os.read(self.read_dev, length)
-                else:
-                    return data
+                    data = self._os_read(length)
+                    if data:
+                        return data
+                    remaining = self.READ_TIMEOUT - (time.monotonic() - start)
+                # one last try if still no data:
+                return self._os_read(length)
             case _:
                 raise NotImplementedError("Unsupported Retry Strategy")
 
+    def _selectable(self) -> int:
+        return self.read_dev
+
+    def _read_nowait(self, length: int = 32) -> bytes:
+        return self._os_read(length)
+
+    async def _read_async(self, length: int = 32) -> bytes:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def on_readable() -> None:
+            if future.done():
+                return
+            try:
+                future.set_result(self._os_read(length))
+            except OSError as e:
+                future.set_exception(e)
+
+        loop.add_reader(self.read_dev, on_readable)
+        try:
+            return await future
+        finally:
+            loop.remove_reader(self.read_dev)
+
     def _write(self, data: bytes) -> None:
         os.write(self.write_dev, data)
 
-    def _dispose(self) -> None:
-        os.close(self.dev)
+    def _write_many(self, parts: list[bytes]) -> None:
+        views = as_views(parts)
+        while views:
+            views = consume(views, os.writev(self.write_dev, views[:IOV_MAX]))
 
     @staticmethod
     def list_available_devices() -> list[str]:
@@ -3,13 +3,25 @@ Backend to support Brother QL-series printers via network.
 Works cross-platform.
 """
 
+import asyncio
+import functools
+import selectors
 import socket
-import time
-
-import select
+import weakref
+from urllib.parse import urlsplit
 
 from .abstract import BaseBrotherQLBackend
-from .retry_strategies import RetryStrategy
+from ..utils.buffers import IOV_MAX, as_views, consume
+
+
+def _close_socket(sock: socket.socket, write_selector: selectors.BaseSelector) -> None:
+    write_selector.close()
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        # not connected (anymore)
+        pass
+    sock.close()
 
 
 class BrotherQLBackendNetwork(BaseBrotherQLBackend):
@@ -17,9 +29,9 @@ class BrotherQLBackendNetwork(BaseBrotherQLBackend):
     BrotherQL backend using the Linux Kernel USB Printer Device Handles
     """
 
-    RETRY_STRATEGY = RetryStrategy.SOCKET_TIMEOUT
-
     READ_TIMEOUT = 0.01
+    WRITE_TIMEOUT = 10.0
+    RX_BUFFER_SIZE = 4096
 
     def __init__(self, device_specifier: str) -> None:
         """
@@ -36,8 +48,16 @@ class BrotherQLBackendNetwork(BaseBrotherQLBackend):
             # except OSError as e:
             #    raise ValueError('Could not connect to the device.')
 
-            asocket.settimeout(self.get_socket_timeout_for_retry_strategy())
+            # The socket stays non-blocking, all waiting is done by the selector
+            asocket.setblocking(False)
             self.s = asocket
+            self._rx_buf = bytearray(self.RX_BUFFER_SIZE)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(asocket, selectors.EVENT_READ)
+            # separate selector for writing, the read one only reports incoming data
+            self._write_selector = selectors.DefaultSelector()
+            self._write_selector.register(asocket, selectors.EVENT_WRITE)
+            self._finalizer = weakref.finalize(self, _close_socket, asocket, self._write_selector)
 
         elif isinstance(device_specifier, int):
             self.dev = device_specifier
@@ -45,41 +65,67 @@ class BrotherQLBackendNetwork(BaseBrotherQLBackend):
             raise NotImplementedError("Currently the printer can be specified either via an appropriate string or via an os.open() handle.")
 
     def _read(self, length: int = 32) -> bytes:
-        if self.RETRY_STRATEGY in [RetryStrategy.SOCKET_TIMEOUT, RetryStrategy.TRY_TWICE]:
-            if self.RETRY_STRATEGY == RetryStrategy.SOCKET_TIMEOUT:
-                tries = 1
-            if self.RETRY_STRATEGY == RetryStrategy.TRY_TWICE:
-                tries = 2
-
-            for i in range(tries):
-                try:
-                    data = self.s.recv(length)
-                    return data
-                except socket.timeout:
-                    pass
+        if not self._selector.select(self.READ_TIMEOUT):
             return b""
-        elif self.RETRY_STRATEGY == RetryStrategy.SELECT:
-            data = b""
-            start = time.time()
-            while (not data) and (time.time() - start < self.READ_TIMEOUT):
-                result, _, _ = select.select([self.s], [], [], 0)
-                if self.s in result:
-                    data += self.s.recv(length)
-                if data:
-                    break
-                time.sleep(0.001)
-            return data
-        else:
-            raise NotImplementedError("Unsupported Retry Strategy")
+        return self._read_nowait(length)
 
-    def _write(self, data: bytes) -> None:
-        self.s.settimeout(10)
-        self.s.sendall(data)
-        self.s.settimeout(self.READ_TIMEOUT)
+    def _selectable(self) -> socket.socket:
+        return self.s
 
-    def _dispose(self) -> None:
-        self.s.shutdown(socket.SHUT_RDWR)
-        self.s.close()
+    def _read_nowait(self, length: int = 32) -> bytes:
+        try:
+            n = self.s.recv_into(self._rx_buf, min(length, self.RX_BUFFER_SIZE))
+        except BlockingIOError:
+            return b""
+        if n == 0 and length:
+            # readable without data: the printer closed the connection
+            raise ConnectionResetError("The printer closed the connection.")
+        return bytes(memoryview(self._rx_buf)[:n])
+
+    async def _read_async(self, length: int = 32) -> bytes:
+        data = await asyncio.get_running_loop().sock_recv(self.s, length)
+        if not data and length:
+            # sock_recv() waits for the socket to be readable, no data then means the printer closed the connection
+            raise ConnectionResetError("The printer closed the connection.")
+        return data
+
+    async def _write_async(self, data: bytes | list[bytes]) -> None:
+        loop = asyncio.get_running_loop()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = [data]
+        for part in data:
+            await loop.sock_sendall(self.s, part)
+
+    def _write(self, data: bytes) -> None:
+        self._send_views(as_views([data]))
+
+    def _write_many(self, parts: list[bytes]) -> None:
+        if not hasattr(self.s, "sendmsg"):
+            # e.g. on Windows
+            return super()._write_many(parts)
+
+        # Cork the connection so that the parts leave in full segments despite TCP_NODELAY
+        cork = hasattr(socket, "TCP_CORK")
+        if cork:
+            self.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+        try:
+            self._send_views(as_views(parts))
+        finally:
+            if cork:
+                self.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+
+    def _send_views(self, views: list[memoryview]) -> None:
+        while views:
+            try:
+                if len(views) == 1:
+                    sent = self.s.send(views[0])
+                else:
+                    sent = self.s.sendmsg(views[:IOV_MAX])
+            except BlockingIOError:
+                if not self._write_selector.select(self.WRITE_TIMEOUT):
+                    raise TimeoutError("Timed out while sending data to the printer.")
+                continue
+            views = consume(views, sent)
 
     @staticmethod
     def list_available_devices() -> list[str]:
@@ -96,15 +142,9 @@ class BrotherQLBackendNetwork(BaseBrotherQLBackend):
         return ["tcp://" + path for path in paths]
 
     @staticmethod
+    @functools.lru_cache(maxsize=128)
     def extract_host_port_from_device_identifier(device_identifier: str) -> tuple[str, int]:
-        device_identifier.lstrip("tcp://")
-
-        host, _, port = device_identifier.partition(":")
-        port = int(port) if port else 9100
-        return host, port
-
-    def get_socket_timeout_for_retry_strategy(self):
-        if self.RETRY_STRATEGY in [RetryStrategy.SOCKET_TIMEOUT, RetryStrategy.TRY_TWICE]:
-            return self.READ_TIMEOUT
-        else:
-            return 0
+        parts = urlsplit("//" + device_identifier.removeprefix("tcp://"))
+        if not parts.hostname:
+            raise ValueError(f"No host in network device identifier: {device_identifier}")
+        return parts.hostname, parts.port or 9100
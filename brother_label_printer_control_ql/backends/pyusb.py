@@ -6,7 +6,11 @@ Requires PyUSB: https://github.com/walac/pyusb/
 Install via `pip install pyusb`
 """
 
+import array
+import re
+import threading
 import time
+import weakref
 
 import usb.core
 import usb.util
@@ -15,6 +19,22 @@ from select import select
 from .abstract import BaseBrotherQLBackend
 from .retry_strategies import RetryStrategy
 
+_USB_IDENTIFIER_RE = re.compile(r"(?:usb://)?0x([0-9a-fA-F]{1,4}):0x([0-9a-fA-F]{1,4})(?:[_/](.*))?$")
+
+_SERIAL_IDENTIFIER_FMT = "usb://0x{:04x}:0x{:04x}_{}".format
+_IDENTIFIER_FMT = "usb://0x{:04x}:0x{:04x}".format
+
+_devices_lock = threading.Lock()
+_cached_devices: list[usb.core.Device] | None = None
+_cached_serials: dict[tuple[int, int, int, int], str | None] = {}
+_cached_endpoints: dict[tuple[int, int, int, int], tuple[usb.core.Endpoint, usb.core.Endpoint]] = {}
+
+
+def _release_device(dev: usb.core.Device, reattach_kernel_driver: bool) -> None:
+    usb.util.dispose_resources(dev)
+    if reattach_kernel_driver:
+        dev.attach_kernel_driver(0)
+
 
 class BrotherQLBackendPyUSB(BaseBrotherQLBackend):
     """
@@ -25,6 +45,7 @@ class BrotherQLBackendPyUSB(BaseBrotherQLBackend):
 
     READ_TIMEOUT = 10.0  # ms
     WRITE_TIMEOUT = 15000.0  # ms
+    MAX_TRANSFER_SIZE = 2 * 1024 * 1024  # bytes per bulk transfer
 
     def __init__(self, device_specifier: str) -> None:
         """
@@ -33,44 +54,61 @@ class BrotherQLBackendPyUSB(BaseBrotherQLBackend):
         """
         vendor, product, serial = BrotherQLBackendPyUSB.extract_vendor_product_serial_from_device_identifier(device_specifier)
 
-        self.dev: usb.core.Device | None = None
-        for device in BrotherQLBackendPyUSB.list_available_devices_as_usb():
-            if device.idVendor == vendor and device.idProduct == product or (serial and device.iSerialNumber == serial):
-                self.dev = device
-                break
-
-        if self.dev is None:
-            raise ValueError("Device not found")
-
         try:
-            assert self.dev.is_kernel_driver_active(0)
-            self.dev.detach_kernel_driver(0)
-            self.was_kernel_driver_active = True
-        except (NotImplementedError, AssertionError):
-            self.was_kernel_driver_active = False
+            self._open(BrotherQLBackendPyUSB._find_device(vendor, product, serial))
+        except (ValueError, usb.core.USBError):
+            # The cached scan may be stale, e.g. after the printer was unplugged and plugged in again
+            BrotherQLBackendPyUSB.invalidate_device_cache()
+            self._open(BrotherQLBackendPyUSB._find_device(vendor, product, serial))
 
-        # set the active configuration. With no arguments, the first configuration will be the active one
-        self.dev.set_configuration()
+        self._read_timeout = int(self.READ_TIMEOUT)
+        self._write_timeout = int(self.WRITE_TIMEOUT)
+        self._rx_arr = array.array("B", bytes(32))
 
-        cfg = self.dev.get_active_configuration()
-        intf = usb.util.find_descriptor(cfg, bInterfaceClass=7)
-        assert intf is not None
-
-        ep_match_in = lambda e: usb.util.endpoint_direction(e.bEndpointAddress) == usb.util.ENDPOINT_IN
-        ep_match_out = lambda e: usb.util.endpoint_direction(e.bEndpointAddress) == usb.util.ENDPOINT_OUT
+    @staticmethod
+    def _find_device(vendor: int, product: int, serial: str | None) -> usb.core.Device:
+        """The device from the (cached) scan of the bus matching the identifier."""
+        candidates = [d for d in BrotherQLBackendPyUSB.list_available_devices_as_usb() if d.idVendor == vendor and d.idProduct == product]
+        if serial:
+            # Only reads the serial strings (a control transfer each, unless cached) of the matching devices
+            dev = next((d for d in candidates if BrotherQLBackendPyUSB.get_serial(d) == serial), None)
+        else:
+            dev = candidates[0] if candidates else None
 
-        ep_in = usb.util.find_descriptor(intf, custom_match=ep_match_in)
-        ep_out = usb.util.find_descriptor(intf, custom_match=ep_match_out)
+        if dev is None:
+            raise ValueError("Device not found")
+        return dev
 
-        assert ep_in is not None
-        assert ep_out is not None
+    def _open(self, dev: usb.core.Device) -> None:
+        """Claim the device from the kernel driver and look up its endpoints."""
+        self.dev = dev
+        try:
+            self.was_kernel_driver_active = self.dev.is_kernel_driver_active(0)
+        except NotImplementedError:
+            self.was_kernel_driver_active = False
+        if self.was_kernel_driver_active:
+            self.dev.detach_kernel_driver(0)
+        self._finalizer = weakref.finalize(self, _release_device, self.dev, self.was_kernel_driver_active)
 
-        self.write_dev = ep_out
-        self.read_dev = ep_in
+        try:
+            self.read_dev, self.write_dev = BrotherQLBackendPyUSB._get_endpoints(self.dev)
+        except usb.core.USBError:
+            # hand the device back before giving up on it
+            try:
+                self._finalizer()
+            except usb.core.USBError:
+                pass
+            raise
 
     def _raw_read(self, length: int = 32) -> bytes:
-        # pyusb Device.read() operations return array() type - convert it to bytes()
-        return bytes(self.read_dev.read(length))
+        # let pyusb fill the preallocated array instead of allocating one for every read
+        if len(self._rx_arr) != length:
+            self._rx_arr = array.array("B", bytes(length))
+        try:
+            n = self.read_dev.read(self._rx_arr, self._read_timeout)
+        except usb.core.USBTimeoutError:
+            return b""
+        return bytes(memoryview(self._rx_arr)[:n])
 
     def _read(self, length: int = 32) -> bytes:
         match self.RETRY_STRATEGY:
@@ -100,17 +138,49 @@ class BrotherQLBackendPyUSB(BaseBrotherQLBackend):
                 raise NotImplementedError("Unsupported Retry Strategy")
 
     def _write(self, data: bytes) -> None:
-        self.write_dev.write(data, int(self.WRITE_TIMEOUT))
+        self._write_many([data])
 
-    def _dispose(self) -> None:
-        usb.util.dispose_resources(self.dev)
-        del self.write_dev, self.read_dev
-        if self.was_kernel_driver_active:
-            self.dev.attach_kernel_driver(0)
-        del self.dev
+    def _write_many(self, parts: list[bytes]) -> None:
+        """Coalesce the data into bulk transfers of up to MAX_TRANSFER_SIZE bytes."""
+        transfer = array.array("B")
+        for part in parts:
+            view = memoryview(part).cast("B")
+            while view:
+                n = self.MAX_TRANSFER_SIZE - len(transfer)
+                # pyusb would copy anything but an array('B') into one, so fill the array directly
+                transfer.frombytes(view[:n])
+                view = view[n:]
+                if len(transfer) >= self.MAX_TRANSFER_SIZE:
+                    self._bulk_write(transfer)
+                    transfer = array.array("B")
+        if transfer:
+            self._bulk_write(transfer)
+
+    def _bulk_write(self, transfer: array.array) -> None:
+        written = self.write_dev.write(transfer, self._write_timeout)
+        while written < len(transfer):
+            transfer = transfer[written:]
+            written = self.write_dev.write(transfer, self._write_timeout)
+
+    @staticmethod
+    def invalidate_device_cache() -> None:
+        global _cached_devices
+        with _devices_lock:
+            _cached_devices = None
+            _cached_serials.clear()
+            _cached_endpoints.clear()
 
     @staticmethod
     def list_available_devices_as_usb() -> list[usb.core.Device]:
+        """The Brother printers on the USB bus. The scan is cached until `invalidate_device_cache` is called."""
+        global _cached_devices
+        with _devices_lock:
+            if _cached_devices is None:
+                _cached_devices = BrotherQLBackendPyUSB._find_usb_devices()
+            return list(_cached_devices)
+
+    @staticmethod
+    def _find_usb_devices() -> list[usb.core.Device]:
         class USBFindClass:
             def __init__(self, class_):
                 self._class = class_
@@ -138,19 +208,91 @@ class BrotherQLBackendPyUSB(BaseBrotherQLBackend):
             The 'identifier' is of the format idVendor:idProduct_iSerialNumber.
         """
 
-        def extract_identifier(dev: usb.Device) -> str:
-            try:
-                serial = usb.util.get_string(dev, 256, dev.iSerialNumber)
-                return "usb://0x{:04x}:0x{:04x}_{}".format(dev.idVendor, dev.idProduct, serial)
-            except:
-                return "usb://0x{:04x}:0x{:04x}".format(dev.idVendor, dev.idProduct)
+        def extract_identifier(dev: usb.core.Device) -> str:
+            serial = BrotherQLBackendPyUSB.get_serial(dev)
+            if serial is not None:
+                return _SERIAL_IDENTIFIER_FMT(dev.idVendor, dev.idProduct, serial)
+            return _IDENTIFIER_FMT(dev.idVendor, dev.idProduct)
 
         return [extract_identifier(printer) for printer in BrotherQLBackendPyUSB.list_available_devices_as_usb()]
 
+    @staticmethod
+    def get_serial(dev: usb.core.Device) -> str | None:
+        """The serial number string of the device (None if unavailable), cached per device."""
+        key = (dev.bus, dev.address, dev.idVendor, dev.idProduct)
+        with _devices_lock:
+            if key in _cached_serials:
+                return _cached_serials[key]
+        if not dev.iSerialNumber:
+            # string descriptor index 0: the device has no serial number
+            serial = None
+        else:
+            serial = BrotherQLBackendPyUSB._get_serial_from_sysfs(dev)
+            if serial is None:
+                try:
+                    serial = usb.util.get_string(dev, 256, dev.iSerialNumber)
+                except (usb.core.USBError, ValueError, NotImplementedError):
+                    serial = None
+        with _devices_lock:
+            _cached_serials[key] = serial
+        return serial
+
+    @staticmethod
+    def _get_endpoints(dev: usb.core.Device) -> tuple[usb.core.Endpoint, usb.core.Endpoint]:
+        """
+        The (in, out) endpoints of the printer interface, configuring the device if necessary.
+        Cached per device, so reconnecting to the same printer skips the descriptor traversal.
+        """
+        key = (dev.bus, dev.address, dev.idVendor, dev.idProduct)
+        with _devices_lock:
+            if key in _cached_endpoints:
+                return _cached_endpoints[key]
+
+        # SET_CONFIGURATION resets the endpoints, so only issue it if the device isn't configured yet
+        try:
+            cfg = dev.get_active_configuration()
+        except usb.core.USBError:
+            cfg = None
+        if cfg is None or cfg.bConfigurationValue != 1:
+            # With no arguments, the first configuration will be the active one
+            dev.set_configuration()
+            cfg = dev.get_active_configuration()
+
+        intf = usb.util.find_descriptor(cfg, bInterfaceClass=7)
+        assert intf is not None
+
+        ep_match_in = lambda e: usb.util.endpoint_direction(e.bEndpointAddress) == usb.util.ENDPOINT_IN
+        ep_match_out = lambda e: usb.util.endpoint_direction(e.bEndpointAddress) == usb.util.ENDPOINT_OUT
+
+        ep_in = usb.util.find_descriptor(intf, custom_match=ep_match_in)
+        ep_out = usb.util.find_descriptor(intf, custom_match=ep_match_out)
+
+        assert ep_in is not None
+        assert ep_out is not None
+
+        with _devices_lock:
+            _cached_endpoints[key] = (ep_in, ep_out)
+        return ep_in, ep_out
+
+    @staticmethod
+    def _get_serial_from_sysfs(dev: usb.core.Device) -> str | None:
+        """The serial number as exported by the Linux kernel, which avoids a control transfer to the device."""
+        try:
+            ports = dev.port_numbers
+        except (usb.core.USBError, NotImplementedError):
+            return None
+        if not ports:
+            return None
+        path = "/sys/bus/usb/devices/{}-{}/serial".format(dev.bus, ".".join(map(str, ports)))
+        try:
+            with open(path) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
     @staticmethod
     def extract_vendor_product_serial_from_device_identifier(device_identifier: str) -> tuple[int, int, str]:
-        device_identifier = device_identifier.lstrip("usb://")
-        vendor_product, _, serial = device_identifier.partition("/")
-        vendor, product = vendor_product.split(":")
-        vendor, product = int(vendor, 16), int(product, 16)
-        return vendor, product, serial
+        match = _USB_IDENTIFIER_RE.match(device_identifier)
+        if not match:
+            raise ValueError(f"Invalid USB device identifier: {device_identifier}")
+        return int(match[1], 16), int(match[2], 16), match[3] or ""
@@ -74,8 +74,8 @@ def main():
         identifier = args.printer
 
     # Finally, do the actual printing.
-    printer = selected_backend.printer(identifier)
-    printer.send(instructions=content, blocking=True)
+    with selected_backend.printer(identifier) as printer:
+        printer.send(instructions=content, blocking=True)
 
 
 if __name__ == "__main__":
@@ -11,7 +11,7 @@ from ..raster import BrotherQLRaster
 @click.option(
     "-l",
     "--label",
-    type=click.Choice(Labels.identifiers()),
+    type=click.Choice(Labels.identifiers(), case_sensitive=False),
     envvar="BROTHER_QL_LABEL",
     help="The label (size, type - die-cut or endless). Run `brother_ql info labels` for a full list including ideal pixel dimensions.",
 )
@@ -52,5 +52,5 @@ def print_cmd(ctx, *args, **kwargs):
     del kwargs["label"]
     instructions = qlr.generate_instructions(images, label, **kwargs)
 
-    printer = backend.printer(printer_identifier)
-    printer.send(instructions=instructions, blocking=True)
+    with backend.printer(printer_identifier) as printer:
+        printer.send(instructions=instructions, blocking=True)
@@ -1,12 +1,31 @@
+import io
+import os
+
 import click
 
 from ..backends import Backend
 
 
+def _read_instructions(file) -> bytes | bytearray:
+    """Read the instruction file straight into a buffer of its size, or plainly for pipes and the like."""
+    try:
+        size = os.fstat(file.fileno()).st_size
+    except (OSError, io.UnsupportedOperation):
+        size = 0
+    if not size:
+        return file.read()
+
+    buf = bytearray(size)
+    n = file.readinto(buf)
+    del buf[n:]
+    buf += file.read()  # in case the file grew in the meantime
+    return buf
+
+
 @click.command(name="send", short_help="send an instruction file to the printer")
 @click.argument("instructions", type=click.File("rb"))
 @click.pass_context
 def send_cmd(ctx, *args, **kwargs):
     backend = Backend(ctx.meta.get("BACKEND"))
-    printer = backend.printer(ctx.meta.get("PRINTER"))
-    printer.send(instructions=kwargs["instructions"].read(), blocking=True)
+    with backend.printer(ctx.meta.get("PRINTER")) as printer:
+        printer.send(instructions=_read_instructions(kwargs["instructions"]), blocking=True)
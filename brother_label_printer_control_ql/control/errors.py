@@ -16,10 +16,13 @@ class RespErrorInformation1(IntEnum):
 
     @staticmethod
     def check_for_error(error_info: int) -> "RespErrorInformation1 | None":
-        for error in RespErrorInformation1:
-            if error.is_present(error_info):
-                return error
-        return None
+        """The error of the lowest bit set in the error information byte, if any."""
+        return _ERROR_INFORMATION_1_TABLE[error_info & 0xFF]
+
+
+_ERROR_INFORMATION_1_TABLE: tuple[RespErrorInformation1 | None, ...] = tuple(
+    RespErrorInformation1((value & -value).bit_length() - 1) if value else None for value in range(256)
+)
 
 
 class RespErrorInformation2(IntEnum):
@@ -37,7 +40,10 @@ class RespErrorInformation2(IntEnum):
 
     @staticmethod
     def check_for_error(error_info: int) -> "RespErrorInformation2 | None":
-        for error in RespErrorInformation2:
-            if error.is_present(error_info):
-                return error
-        return None
+        """The error of the lowest bit set in the error information byte, if any."""
+        return _ERROR_INFORMATION_2_TABLE[error_info & 0xFF]
+
+
+_ERROR_INFORMATION_2_TABLE: tuple[RespErrorInformation2 | None, ...] = tuple(
+    RespErrorInformation2((value & -value).bit_length() - 1) if value else None for value in range(256)
+)
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+from typing import Final
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OpCode:
     signature: bytes
     name: str
@@ -9,32 +10,80 @@ class OpCode:
     description: str
 
 
+# Signatures of the commands the rasterizer emits, shared with the reader side (OPCODES)
+OP_PREAMBLE: Final = b"\x00"
+OP_COMPRESSION: Final = b"\x4D"  # M
+OP_RASTER_QL: Final = b"\x67"
+OP_RASTER_PTOUCH: Final = b"\x47"
+OP_RASTER_2COLOR: Final = b"\x77"
+OP_ZERO_RASTER: Final = b"\x5a"
+OP_PRINT: Final = b"\x0C"  # 0x0C = FF  = Form Feed
+OP_PRINT_FINAL: Final = b"\x1A"  # 0x1A = ^Z = SUB; here: EOF = End of File
+OP_INIT: Final = b"\x1b\x40"  # ESC @
+OP_MODE_SETTING: Final = b"\x1b\x69\x61"  # ESC i a
+OP_MEDIA_QUALITY: Final = b"\x1b\x69\x7A"  # ESC i z
+OP_VARIOUS: Final = b"\x1b\x69\x4D"  # ESC i M
+OP_CUT_EVERY: Final = b"\x1b\x69\x41"  # ESC i A
+OP_EXPANDED: Final = b"\x1b\x69\x4B"  # ESC i K
+OP_MARGINS: Final = b"\x1b\x69\x64"  # ESC i d
+OP_STATUS_REQUEST: Final = b"\x1b\x69\x53"  # ESC i S
+
 OPCODES = [
-    OpCode(b"\x00", "preamble", -1, "Preamble, 200-300x 0x00 to clear comamnd buffer"),
-    OpCode(b"\x4D", "compression", 1, ""),
-    OpCode(b"\x67", "raster QL", -1, ""),
-    OpCode(b"\x47", "raster P-touch", -1, ""),
-    OpCode(b"\x77", "2-color raster QL", -1, ""),
-    OpCode(b"\x5a", "zero raster", 0, "empty raster line"),
-    OpCode(b"\x0C", "print", 0, "print intermediate page"),
-    OpCode(b"\x1A", "print", 0, "print final page"),
-    OpCode(b"\x1b\x40", "init", 0, "initialization"),
-    OpCode(b"\x1b\x69\x61", "mode setting", 1, ""),
+    OpCode(OP_PREAMBLE, "preamble", -1, "Preamble, 200-300x 0x00 to clear comamnd buffer"),
+    OpCode(OP_COMPRESSION, "compression", 1, ""),
+    OpCode(OP_RASTER_QL, "raster QL", -1, ""),
+    OpCode(OP_RASTER_PTOUCH, "raster P-touch", -1, ""),
+    OpCode(OP_RASTER_2COLOR, "2-color raster QL", -1, ""),
+    OpCode(OP_ZERO_RASTER, "zero raster", 0, "empty raster line"),
+    OpCode(OP_PRINT, "print", 0, "print intermediate page"),
+    OpCode(OP_PRINT_FINAL, "print", 0, "print final page"),
+    OpCode(OP_INIT, "init", 0, "initialization"),
+    OpCode(OP_MODE_SETTING, "mode setting", 1, ""),
     OpCode(b"\x1b\x69\x21", "automatic status", 1, ""),
-    OpCode(b"\x1b\x69\x7A", "media/quality", 10, "print-media and print-quality"),
-    OpCode(b"\x1b\x69\x4D", "various", 1, "Auto cut flag in bit 7"),
-    OpCode(b"\x1b\x69\x41", "cut-every", 1, "cut every n-th page"),
-    OpCode(b"\x1b\x69\x4B", "expanded", 1, ""),
-    OpCode(b"\x1b\x69\x64", "margins", 2, ""),
+    OpCode(OP_MEDIA_QUALITY, "media/quality", 10, "print-media and print-quality"),
+    OpCode(OP_VARIOUS, "various", 1, "Auto cut flag in bit 7"),
+    OpCode(OP_CUT_EVERY, "cut-every", 1, "cut every n-th page"),
+    OpCode(OP_EXPANDED, "expanded", 1, ""),
+    OpCode(OP_MARGINS, "margins", 2, ""),
     OpCode(b"\x1b\x69\x55\x77\x01", "amedia", 127, "Additional media information command"),
     OpCode(b"\x1b\x69\x55\x4A", "jobid", 14, "Job ID setting command"),
     OpCode(b"\x1b\x69\x58\x47", "request_config", 0, "Request transmission of .ini config file of printer"),
-    OpCode(b"\x1b\x69\x53", "status request", 0, "A status information request sent to the printer"),
+    OpCode(OP_STATUS_REQUEST, "status request", 0, "A status information request sent to the printer"),
     OpCode(b"\x80\x20\x42", "status response", 29, "A status response received from the printer"),
 ]
 
 
+# Byte-wise trie of the signatures: nested dicts keyed by the next signature byte, ending in the OpCode.
+# The signatures are prefix-free, so every path ends in exactly one opcode.
+_OPCODE_TRIE: dict = {}
+for _opcode in OPCODES:
+    _node = _OPCODE_TRIE
+    for _byte in _opcode.signature[:-1]:
+        _node = _node.setdefault(_byte, {})
+    _node[_opcode.signature[-1]] = _opcode
+del _opcode, _node, _byte
+
+
+def match_opcode_at(data: bytes | memoryview, pos: int = 0) -> OpCode:
+    """
+    The opcode starting at position `pos` of the data, found with one lookup per signature byte.
+
+    :raises ValueError: if the data doesn't contain a known opcode at that position.
+    """
+    node = _OPCODE_TRIE
+    for i in range(pos, len(data)):
+        node = node.get(data[i])
+        if node is None:
+            break
+        if isinstance(node, OpCode):
+            return node
+    raise ValueError("No opcode matching data starting with {!r}".format(bytes(data[pos : pos + 4])))
+
+
 def match_opcode(data: bytes) -> OpCode:
-    matching_opcodes = [opcode for opcode in OPCODES if data.startswith(opcode.signature)]
-    assert len(matching_opcodes) == 1
-    return matching_opcodes[0]
+    """
+    The opcode the data starts with.
+
+    :raises ValueError: if the data doesn't start with a known opcode.
+    """
+    return match_opcode_at(data)
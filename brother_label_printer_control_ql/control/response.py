@@ -1,5 +1,8 @@
+import logging
+import struct
 from dataclasses import dataclass
 from logging import Logger
+from typing import Final
 
 from brother_label_printer_control_ql.control.constants import (
     RESP_BYTE_NAMES,
@@ -11,59 +14,66 @@ from brother_label_printer_control_ql.control.constants import (
 from .errors import RespErrorInformation1, RespErrorInformation2
 from ..utils.hex import hex_format
 
-@dataclass(frozen=True)
+# error information 1 + 2 (bytes 8, 9), media width (10), media type (11), media length (17), status type (18), phase type (19)
+_RESPONSE_FIELDS = struct.Struct("<8xBBBB5xBBB")
+
+# One line per named response byte, filled with the byte values by a single logger call
+_BYTE_DUMP_FMT = "\n".join(f"Byte {i:2d} {byte_name + ':':>24s} %02X" for i, byte_name in enumerate(RESP_BYTE_NAMES))
+
+_NO_ERRORS: Final[tuple[str, ...]] = ()
+
+_MEDIA_TYPES = {member.value: member for member in RespMediaTypes}
+_STATUS_TYPES = {member.value: member for member in RespStatusTypes}
+_PHASE_TYPES = {member.value: member for member in RespPhaseTypes}
+
+@dataclass(frozen=True, slots=True)
 class PrinterResponse:
     status_type: RespStatusTypes
     phase_type: RespPhaseTypes
     media_type: RespMediaTypes
     media_width: int
     media_length: int
-    errors: list[str]
+    errors: tuple[str, ...]
 
     @staticmethod
     def from_bytes(data: bytes, logger: Logger) -> "PrinterResponse":
         data = bytes(data)
 
         if len(data) < 32:
-            raise NameError("Insufficient amount of data received", hex_format(data))
+            raise ValueError("Insufficient amount of data received", hex_format(data))
         if not data.startswith(b"\x80\x20\x42"):
-            raise NameError("Printer response doesn't start with the usual header (80:20:42)", hex_format(data))
+            raise ValueError("Printer response doesn't start with the usual header (80:20:42)", hex_format(data))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(_BYTE_DUMP_FMT, *data[: len(RESP_BYTE_NAMES)])
 
-        for i, byte_name in enumerate(RESP_BYTE_NAMES):
-            logger.debug("Byte %2d %24s %02X", i, byte_name + ":", data[i])
+        error_info_1, error_info_2, media_width, media_type, media_length, status_type, phase_type = _RESPONSE_FIELDS.unpack_from(data)
 
-        errors = []
-        error_info_1 = data[8]
-        error_info_2 = data[9]
-        if error1 := RespErrorInformation1.check_for_error(error_info_1):
+        errors = _NO_ERRORS
+        # compare with None: the errors of bit 0 are IntEnum members of value 0 and thus falsy
+        if (error1 := RespErrorInformation1.check_for_error(error_info_1)) is not None:
             logger.error("Error: " + error1.name)
-            errors.append(error1.name)
-        if error2 := RespErrorInformation2.check_for_error(error_info_2):
+            errors += (error1.name,)
+        if (error2 := RespErrorInformation2.check_for_error(error_info_2)) is not None:
             logger.error("Error: " + error2.name)
-            errors.append(error2.name)
-
-        media_width = data[10]
-        media_length = data[17]
+            errors += (error2.name,)
 
-        media_type = data[11]
-        try:
-            media_type = RespMediaTypes(media_type)
+        if media_type in _MEDIA_TYPES:
+            media_type = _MEDIA_TYPES[media_type]
             logger.debug("Media type: %s", media_type.name)
-        except ValueError:
+        else:
             logger.error("Unknown media type %02X", media_type)
 
-        status_type = data[18]
-        try:
-            status_type = RespStatusTypes(status_type)
+        if status_type in _STATUS_TYPES:
+            status_type = _STATUS_TYPES[status_type]
             logger.debug("Status type: %s", status_type.name)
-        except ValueError:
+        else:
             logger.error("Unknown status type %02X", status_type)
 
-        phase_type = data[19]
-        try:
-            phase_type = RespPhaseTypes(phase_type)
+        if phase_type in _PHASE_TYPES:
+            phase_type = _PHASE_TYPES[phase_type]
             logger.debug("Phase type: %s", phase_type.name)
-        except ValueError:
+        else:
             logger.error("Unknown phase type %02X", phase_type)
 
         return PrinterResponse(
@@ -1,40 +1,68 @@
+import functools
 import struct
-from io import BytesIO
+from typing import Final
 
-import packbits
 from PIL import Image
 
+from .control.op_codes import (
+    OP_COMPRESSION,
+    OP_CUT_EVERY,
+    OP_EXPANDED,
+    OP_INIT,
+    OP_MARGINS,
+    OP_MEDIA_QUALITY,
+    OP_MODE_SETTING,
+    OP_PRINT,
+    OP_PRINT_FINAL,
+    OP_RASTER_2COLOR,
+    OP_RASTER_PTOUCH,
+    OP_RASTER_QL,
+    OP_STATUS_REQUEST,
+    OP_VARIOUS,
+    OP_ZERO_RASTER,
+)
 from .exceptions import BrotherQLRasterError
 from .models import Model
+from .utils.run_length import pack_bits
+
+# Every command is appended to the data with a single operation.
+# Passing a bytearray as data extends it in place instead of copying the instructions generated so far.
+
+_INVALIDATE: Final[bytes] = bytes(200)  # 200x 0x00 to clear the command buffer
+_MARGINS = struct.Struct("<3sH")
+_MEDIA_AND_QUALITY = struct.Struct("<3sB3sLBx")
+_FLAG_COMMAND = struct.Struct("<3sB")
+_FLAG_BYTE = struct.Struct("<1sB")
+_SWITCH_TO_RASTER_MODE = OP_MODE_SETTING + b"\x01"
+
 
 def add_initialize(data: bytes) -> bytes:
-    data += b"\x1B\x40"  # ESC @
+    data += OP_INIT
     return data
 
 
 def add_status_information(data: bytes) -> bytes:
     """Status Information Request"""
-    data += b"\x1B\x69\x53"  # ESC i S
+    data += OP_STATUS_REQUEST
     return data
 
 
 def add_invalidate(data: bytes) -> bytes:
     """clear command buffer"""
-    data += b"\x00" * 200
+    data += _INVALIDATE
     return data
 
 
 def add_margins(data: bytes, dots: int = 0x23) -> bytes:
-    data += b"\x1B\x69\x64"  # ESC i d
-    data += struct.pack("<H", dots)
+    data += _MARGINS.pack(OP_MARGINS, dots)
     return data
 
 
 def add_print(data: bytes, last_page: bool = True) -> bytes:
     if last_page:
-        data += b"\x1A"  # 0x1A = ^Z = SUB; here: EOF = End of File
+        data += OP_PRINT_FINAL
     else:
-        data += b"\x0C"  # 0x0C = FF  = Form Feed
+        data += OP_PRINT
     return data
 
 
@@ -44,62 +72,63 @@ def add_switch_mode(data: bytes) -> bytes:
     Switch to the raster mode on the printers that support
     the mode change (others are in raster mode already).
     """
-    data += b"\x1B\x69\x61\x01"  # ESC i a
+    data += _SWITCH_TO_RASTER_MODE
     return data
 
 
 def add_media_and_quality(data: bytes, rnumber: int, pquality: int, mtype: bytes, mwidth: bytes, mlength: bytes, page_number: int) -> bytes:
-    data += b"\x1B\x69\x7A"  # ESC i z
-
     valid_flags = 0x80
     valid_flags |= (mtype is not None) << 1
     valid_flags |= (mwidth is not None) << 2
     valid_flags |= (mlength is not None) << 3
     valid_flags |= pquality << 6
 
-    data += bytes([valid_flags])
     vals = [mtype, mwidth, mlength]
-    data += b"".join(b"\x00" if val is None else val for val in vals)
-    data += struct.pack("<L", rnumber)
-    data += bytes([0 if page_number == 0 else 1])
-    data += b"\x00"
+    data += _MEDIA_AND_QUALITY.pack(
+        OP_MEDIA_QUALITY,
+        valid_flags,
+        b"".join(b"\x00" if val is None else val for val in vals),
+        rnumber,
+        0 if page_number == 0 else 1,
+    )
     # INFO:  media/quality (1B 69 7A) --> found! (payload: 8E 0A 3E 00 D2 00 00 00 00 00)
     return data
 
 
 def add_autocut(data: bytes, autocut: bool) -> bytes:
     """Autocut"""
-    data += b"\x1B\x69\x4D"  # ESC i M
-    data += bytes([autocut << 6])
+    data += _FLAG_COMMAND.pack(OP_VARIOUS, autocut << 6)
     return data
 
 
 def add_cut_every(data: bytes, n: int) -> bytes:
-    data += b"\x1B\x69\x41"  # ESC i A
-    data += bytes([n & 0xFF])
+    data += _FLAG_COMMAND.pack(OP_CUT_EVERY, n & 0xFF)
     return data
 
 
 def add_expanded_mode(data: bytes, cut_at_end: bool, dpi_600: bool, two_color_printing: bool) -> bytes:
     """Expanded Mode"""
-    data += b"\x1B\x69\x4B"  # ESC i K
-
     flags = 0x00
     flags |= cut_at_end << 3
     flags |= dpi_600 << 6
     flags |= two_color_printing << 0
 
-    data += bytes([flags])
+    data += _FLAG_COMMAND.pack(OP_EXPANDED, flags)
     return data
 
 
 def add_compression(data: bytes, compression: bool) -> bytes:
     """Compression"""
-    data += b"\x4D"  # M
-    data += bytes([compression << 1])
+    data += _FLAG_BYTE.pack(OP_COMPRESSION, compression << 1)
     return data
 
 
+@functools.lru_cache(maxsize=16)
+def _row_headers(prefix: bytes, count: int, length_size: int) -> tuple[bytes, ...]:
+    """Raster row headers for all transmitted lengths below `count`, indexed by the length"""
+    return tuple(prefix + translen.to_bytes(length_size, "little") for translen in range(count))
+
+
 def add_raster_data(data: bytes, model: Model, compression: bool, image: Image, second_image: Image = None) -> bytes:
     if image.size[0] != model.pixel_width:
         fmt = "Wrong pixel width: {}, expected {}"
@@ -115,30 +144,50 @@ def add_raster_data(data: bytes, model: Model, compression: bool, image: Image,
     frames = []
     for image in images:
         image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-        image = image.convert("1")
-        frames.append(bytes(image.tobytes(encoder_name="raw")))
+        if image.mode != "1":
+            # generate_instructions() already hands over binary images, only convert other input
+            image = image.convert("1")
+        frames.append(image.tobytes(encoder_name="raw"))
 
-    frame_len = len(frames[0])
     row_len = images[0].size[0] // 8
-    start = 0
-    file_str = BytesIO()
-    while start + row_len <= frame_len:
-        for i, frame in enumerate(frames):
-            row = frame[start : start + row_len]
-            if compression:
-                row = packbits.encode(row)
-            translen = len(row)  # number of bytes to be transmitted
-            if model.identifier.startswith("PT"):
-                file_str.write(b"\x47")
-                file_str.write(bytes([translen % 256, translen // 256]))
-            else:
-                if second_image:
-                    file_str.write(b"\x77\x01" if i == 0 else b"\x77\x02")
-                else:
-                    file_str.write(b"\x67\x00")
-                file_str.write(bytes([translen]))
-            file_str.write(row)
-        start += row_len
-
-    data += file_str.getvalue()
+    row_starts = range(0, len(frames[0]) - row_len + 1, row_len)
+
+    # Each row is preceded by a header with the number of bytes transmitted for it, one table of headers per frame.
+    # PackBits output can be longer than the row itself, at most twice as long.
+    count = 2 * row_len + 1
+    if model.identifier.startswith("PT"):
+        headers = [_row_headers(OP_RASTER_PTOUCH, count, 2)] * len(frames)
+    elif second_image:
+        headers = [_row_headers(OP_RASTER_2COLOR + bytes((i + 1,)), min(count, 256), 1) for i in range(len(frames))]
+    else:
+        headers = [_row_headers(OP_RASTER_QL + b"\x00", min(count, 256), 1)] * len(frames)
+
+    # Collect all row headers and payloads and join them once at the end
+    parts = []
+    if compression:
+        # Labels mostly consist of recurring rows (blank space, straight edges), so each distinct row is encoded just once
+        encoded_rows = {}
+        blank_row = bytes(row_len)
+        for start in row_starts:
+            if all(frame[start : start + row_len] == blank_row for frame in frames):
+                # a blank row in all frames takes a single byte: zero raster graphics (only available with compression)
+                parts.append(OP_ZERO_RASTER)
+                continue
+            for i, frame in enumerate(frames):
+                row = frame[start : start + row_len]
+                encoded = encoded_rows.get(row)
+                if encoded is None:
+                    encoded = encoded_rows[row] = pack_bits(row)
+                parts.append(headers[i][len(encoded)])
+                parts.append(encoded)
+    else:
+        # Without compression every row has the same length, and thus the same header
+        # Interleave the rows of all frames (black and red for two-color printing), then put the headers in between
+        views = [memoryview(frame) for frame in frames]
+        rows = [view[start : start + row_len] for start in row_starts for view in views]
+        parts = [b""] * (2 * len(rows))
+        parts[0::2] = [headers[i][row_len] for i in range(len(frames))] * len(row_starts)
+        parts[1::2] = rows
+
+    data += b"".join(parts)
     return data
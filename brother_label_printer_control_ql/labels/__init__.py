@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
+from typing import Final
 
 from .color import Color
 from .form_factor import FormFactor
@@ -48,16 +50,14 @@ class Label:
 
         return out
 
+    @cached_property
+    def _restricted_ids(self) -> frozenset[str]:
+        return frozenset(restricted_model.value.identifier for restricted_model in self.restricted_to_models)
+
     def works_with_model(self, model: Model) -> bool:
         """Method to determine if certain label can be printed by the specified printer model."""
-        if not self.restricted_to_models:
-            return False
-
-        for restricted_model in self.restricted_to_models:
-            if model == restricted_model.value:
-                return True
-
-        return False
+        # a label without restrictions works with all models
+        return not self._restricted_ids or model.identifier in self._restricted_ids
 
 
 class Labels(Enum):
@@ -88,11 +88,15 @@ class Labels(Enum):
 
     @staticmethod
     def from_identifier(identifier: str) -> Label:
-        for label in Labels:
-            if label.value.identifier == identifier:
-                return label.value
-        raise BrotherQLUnknownLabel(f"Label with identifier '{identifier}' not found.")
+        try:
+            return _LABELS_BY_IDENTIFIER[identifier]
+        except KeyError:
+            raise BrotherQLUnknownLabel(f"Label with identifier '{identifier}' not found.") from None
 
     @staticmethod
-    def identifiers() -> list[str]:
-        return [label.value.identifier for label in Labels]
+    def identifiers() -> tuple[str, ...]:
+        return _LABEL_IDENTIFIERS
+
+
+_LABELS_BY_IDENTIFIER: dict[str, Label] = {label.value.identifier: label.value for label in Labels}
+_LABEL_IDENTIFIERS: Final[tuple[str, ...]] = tuple(_LABELS_BY_IDENTIFIER)
@@ -1,8 +1,9 @@
+import functools
 from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LabelOptions:
     cut: bool
     dither: bool
@@ -15,20 +16,36 @@ class LabelOptions:
 
     @staticmethod
     def from_dict(d: dict[str, Any]) -> "LabelOptions":
-        rot = d.get("rotate", "auto")
-        rot = int(rot) if rot != "auto" else rot
-
-        thresh = d.get("threshold", 70)
-        thresh = 100.0 - thresh
-        thresh = min(255, max(0, int(thresh / 100.0 * 255)))
-
-        return LabelOptions(
+        return LabelOptions.from_values(
             cut=d.get("cut", True),
             dither=d.get("dither", False),
             compress=d.get("compress", False),
             red=d.get("red", False),
-            rotate=rot,
+            rotate=d.get("rotate", "auto"),
             dpi_600=d.get("dpi_600", False),
             hq=d.get("hq", True),
+            threshold=d.get("threshold", 70),
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def from_values(cut: bool, dither: bool, compress: bool, red: bool, rotate: int | str, dpi_600: bool, hq: bool, threshold: float) -> "LabelOptions":
+        """
+        The options for the given (CLI style) values, e.g. the threshold in percent.
+        Repeated calls with the same values return the same instance.
+        """
+        rot = int(rotate) if rotate != "auto" else rotate
+
+        thresh = 100.0 - threshold
+        thresh = min(255, max(0, int(thresh / 100.0 * 255)))
+
+        return LabelOptions(
+            cut=cut,
+            dither=dither,
+            compress=compress,
+            red=red,
+            rotate=rot,
+            dpi_600=dpi_600,
+            hq=hq,
             threshold=thresh,
         )
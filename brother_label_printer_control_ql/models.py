@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
+from typing import Final
 
 from .exceptions import BrotherQLUnknownModel
 
-@dataclass
+@dataclass(frozen=True)
 class Model:
     """
     This class represents a printer model. All specifics of a certain model
@@ -39,7 +41,7 @@ class Model:
     def name(self):
         return self.identifier
 
-    @property
+    @cached_property
     def pixel_width(self) -> int:
         return self.number_bytes_per_row * 8
 
@@ -64,11 +66,15 @@ class Models(Enum):
 
     @staticmethod
     def from_identifier(identifier: str) -> Model:
-        for model in Models:
-            if model.value.identifier == identifier:
-                return model.value
-        raise BrotherQLUnknownModel(f"Model '{identifier}' not implemented.")
+        try:
+            return _MODELS_BY_IDENTIFIER[identifier]
+        except KeyError:
+            raise BrotherQLUnknownModel(f"Model '{identifier}' not implemented.") from None
 
     @staticmethod
-    def identifiers() -> list[str]:
-        return [model.value.identifier for model in Models]
+    def identifiers() -> tuple[str, ...]:
+        return _MODEL_IDENTIFIERS
+
+
+_MODELS_BY_IDENTIFIER: dict[str, Model] = {model.value.identifier: model.value for model in Models}
+_MODEL_IDENTIFIERS: Final[tuple[str, ...]] = tuple(_MODELS_BY_IDENTIFIER)
@@ -7,7 +7,10 @@ The central piece of code in this module is the class
 :py:class:`BrotherQLRaster`.
 """
 
+import functools
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Type
 
 import PIL.ImageChops
@@ -32,10 +35,55 @@ from .instructions import (
 from .labels import FormFactor, Label
 from .labels.label_options import LabelOptions
 from .models import Model, Models
-from .utils.image_trafos import filtered_hsv
+from .utils.image_trafos import hsv_bands, hsv_mask
 
 logger = logging.getLogger(__name__)
 
+# Lookup tables for Image.point() on the H, S and V bands, selecting the red and the black parts of an image
+_RED_FILTER_H = [255 if (h < 40 or h > 210) else 0 for h in range(256)]
+_RED_FILTER_S = [255 if s > 100 else 0 for s in range(256)]
+_RED_FILTER_V = [255 if v > 80 else 0 for v in range(256)]
+_BLACK_FILTER_V = [255 if v < 80 else 0 for v in range(256)]
+_PASS_FILTER = [255] * 256
+
+
+_TRANSPOSE_BY_ANGLE = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+
+
+def _rotate(im: Image.Image, angle: int) -> Image.Image:
+    """Rotate counterclockwise, enlarging the image to fit. Multiples of 90° are plain pixel transpositions."""
+    transpose = _TRANSPOSE_BY_ANGLE.get(angle % 360)
+    if transpose is not None:
+        return im.transpose(transpose)
+    return im.rotate(angle, expand=True)
+
+
+def _draft_to_width(im: Image.Image, width: int, rotate: int | str) -> None:
+    """
+    Let the JPEG decoder scale the image down by up to 1/8 while it stays at least `width` pixels wide once rotated.
+    Large photos are resized to the printable width afterwards anyway.
+    """
+    if rotate in ("auto", 0, 180):
+        im.draft(None, (width, 1))
+    elif rotate in (90, 270):
+        im.draft(None, (1, width))
+
+
+def _pad_to_width(im: Image.Image, width: int, right_margin: int) -> Image.Image:
+    """Extend the image to `width` with white, keeping `right_margin` white pixels on its right side."""
+    left = width - im.size[0] - right_margin
+    return PIL.ImageOps.expand(im, border=(left, 0, right_margin, 0), fill=(255,) * len(im.mode))
+
+
+@functools.lru_cache(maxsize=16)
+def _inverted_threshold_lut(threshold: int) -> tuple[int, ...]:
+    """Lookup table mapping greyscale values to black (0) or white (255) after inverting them."""
+    return tuple(0 if 255 - x < threshold else 255 for x in range(256))
+
 
 class BrotherQLRaster:
     """
@@ -46,13 +94,13 @@ class BrotherQLRaster:
 
     :param str model: Choose from the list of available models.
 
-    :ivar bytes data: The resulting bytecode with all instructions.
+    :ivar bytearray data: The resulting bytecode with all instructions. The add_* methods extend it in place.
     :ivar bool exception_on_warning: If set to True, an exception is raised if trying to add instruction which are not supported on the selected model. If set to False, the instruction is simply ignored and a warning sent to logging/stderr.
     """
 
     def __init__(self, model: Model = Models.QL500.value) -> None:
         self.model: Model = model
-        self.data = b""
+        self.data = bytearray()
         self._pquality = True
         self.page_number = 0
         self.cut_at_end = True
@@ -79,15 +127,15 @@ class BrotherQLRaster:
 
     @mtype.setter
     def mtype(self, value) -> None:
-        self._mtype = bytes([value & 0xFF])
+        self._mtype = bytes((value & 0xFF,))
 
     @mwidth.setter
     def mwidth(self, value) -> None:
-        self._mwidth = bytes([value & 0xFF])
+        self._mwidth = bytes((value & 0xFF,))
 
     @mlength.setter
     def mlength(self, value) -> None:
-        self._mlength = bytes([value & 0xFF])
+        self._mlength = bytes((value & 0xFF,))
 
     @pquality.setter
     def pquality(self, value) -> None:
@@ -221,23 +269,32 @@ class BrotherQLRaster:
 
         label_options = LabelOptions.from_dict(kwargs)
 
+        # invariant across the images
+        form_factor = label.form_factor
+        is_endless = form_factor in (FormFactor.ENDLESS, FormFactor.PTOUCH_ENDLESS)
+        is_die_cut = form_factor in (FormFactor.DIE_CUT, FormFactor.ROUND_DIE_CUT)
+        tape_size = label.tape_size
+        feed_margin = label.feed_margin
+        if label_options.dpi_600:
+            dots_expected = [el * 2 for el in dots_printable]
+        else:
+            dots_expected = dots_printable
+        threshold_lut = _inverted_threshold_lut(label_options.threshold)
+
         if label_options.red and not self.model.two_color:
             raise BrotherQLUnsupportedCmd("Printing in red is not supported with the selected model.")
 
-        try:
+        if self.model.mode_setting:
             self.data = self.add_switch_mode(self.data)
-        except BrotherQLUnsupportedCmd:
-            pass
 
         self.data = add_invalidate(self.data)
         self.data = self.add_initialize(self.data)
 
-        try:
+        if self.model.mode_setting:
             self.data = self.add_switch_mode(self.data)
-        except BrotherQLUnsupportedCmd:
-            pass
 
-        for image in images:
+        def prepare(image) -> tuple[Image.Image, Image.Image | None]:
+            """All the image processing for one label, returns the black layer and the red layer when printing in red"""
             if isinstance(image, Image.Image):
                 im = image
             else:
@@ -245,11 +302,14 @@ class BrotherQLRaster:
                     im = Image.open(image)
                 except:
                     raise NotImplementedError("The image argument needs to be an Image() instance, the filename to an image, or a file handle.")
+                if is_endless and im.format == "JPEG":
+                    _draft_to_width(im, dots_expected[0], label_options.rotate)
 
             if im.mode.endswith("A"):
                 # place in front of white background and get red of transparency
                 bg = Image.new("RGB", im.size, (255, 255, 255))
-                bg.paste(im, im.split()[-1])
+                # only the alpha band is needed as mask, split() would copy out every band
+                bg.paste(im, None, im.getchannel("A"))
                 im = bg
             elif im.mode == "P":
                 # Convert GIF ("P") to RGB
@@ -258,103 +318,104 @@ class BrotherQLRaster:
                 # Convert greyscale to RGB if printing on black/red tape
                 im = im.convert("RGB")
 
-            if label_options.dpi_600:
-                dots_expected = [el * 2 for el in dots_printable]
-            else:
-                dots_expected = dots_printable
-
-            if label.form_factor in (FormFactor.ENDLESS, FormFactor.PTOUCH_ENDLESS):
+            if is_endless:
                 if label_options.rotate not in ("auto", 0):
-                    im = im.rotate(label_options.rotate, expand=True)
-                if label_options.dpi_600:
-                    im = im.resize((im.size[0] // 2, im.size[1]))
-                if im.size[0] != dots_printable[0]:
-                    hsize = int((dots_printable[0] / im.size[0]) * im.size[1])
+                    im = _rotate(im, label_options.rotate)
+                # the 600 dpi halving of the width and the fit to the printable width are done in a single resize
+                width = im.size[0] // 2 if label_options.dpi_600 else im.size[0]
+                if width != dots_printable[0]:
+                    hsize = int((dots_printable[0] / width) * im.size[1])
                     im = im.resize((dots_printable[0], hsize), Image.Resampling.LANCZOS)
                     logger.warning("Need to resize the image...")
+                elif width != im.size[0]:
+                    im = im.resize((width, im.size[1]))
                 if im.size[0] < device_pixel_width:
-                    new_im = Image.new(im.mode, (device_pixel_width, im.size[1]), (255,) * len(im.mode))
-                    new_im.paste(im, (device_pixel_width - im.size[0] - right_margin_dots, 0))
-                    im = new_im
-            elif label.form_factor in (FormFactor.DIE_CUT, FormFactor.ROUND_DIE_CUT):
+                    im = _pad_to_width(im, device_pixel_width, right_margin_dots)
+            elif is_die_cut:
                 if label_options.rotate == "auto":
                     if im.size[0] == dots_expected[1] and im.size[1] == dots_expected[0]:
-                        im = im.rotate(90, expand=True)
+                        im = _rotate(im, 90)
                 elif label_options.rotate != 0:
-                    im = im.rotate(label_options.rotate, expand=True)
+                    im = _rotate(im, label_options.rotate)
                 if im.size[0] != dots_expected[0] or im.size[1] != dots_expected[1]:
                     raise ValueError("Bad image dimensions: %s. Expecting: %s." % (im.size, dots_expected))
                 if label_options.dpi_600:
                     im = im.resize((im.size[0] // 2, im.size[1]))
-                new_im = Image.new(im.mode, (device_pixel_width, dots_expected[1]), (255,) * len(im.mode))
-                new_im.paste(im, (device_pixel_width - im.size[0] - right_margin_dots, 0))
-                im = new_im
+                im = _pad_to_width(im, device_pixel_width, right_margin_dots)
 
             if label_options.red:
-                filter_h = lambda h: 255 if (h < 40 or h > 210) else 0
-                filter_s = lambda s: 255 if s > 100 else 0
-                filter_v = lambda v: 255 if v > 80 else 0
-                red_im = filtered_hsv(im, filter_h, filter_s, filter_v)
-                red_im = red_im.convert("L")
-                red_im = PIL.ImageOps.invert(red_im)
-                red_im = red_im.point(lambda x: 0 if x < label_options.threshold else 255, mode="1")
-
-                filter_h = lambda h: 255
-                filter_s = lambda s: 255
-                filter_v = lambda v: 255 if v < 80 else 0
-                black_im = filtered_hsv(im, filter_h, filter_s, filter_v)
-                black_im = black_im.convert("L")
-                black_im = PIL.ImageOps.invert(black_im)
-                black_im = black_im.point(lambda x: 0 if x < label_options.threshold else 255, mode="1")
-                black_im = PIL.ImageChops.subtract(black_im, red_im)
+                # Each layer keeps the thresholded pixels within its colour mask, white elsewhere.
+                # Thresholding the whole image once replaces filtering a full RGB copy per layer.
+                if im.mode != "RGB":
+                    im = im.convert("RGB")
+                hsv = hsv_bands(im)
+                # invert and threshold in a single pass
+                printed = im.convert("L").point(threshold_lut, mode="1")
+
+                red_im = Image.new("1", im.size, threshold_lut[255])
+                red_im.paste(printed, None, hsv_mask(hsv, _RED_FILTER_H, _RED_FILTER_S, _RED_FILTER_V))
+
+                black_im = Image.new("1", im.size, threshold_lut[255])
+                black_im.paste(printed, None, hsv_mask(hsv, _PASS_FILTER, _PASS_FILTER, _BLACK_FILTER_V))
+                im = PIL.ImageChops.subtract(black_im, red_im)
             else:
-                im = im.convert("L")
-                im = PIL.ImageOps.invert(im)
+                if im.mode != "L":
+                    # converting to the same mode would only copy the image
+                    im = im.convert("L")
 
                 if label_options.dither:
-                    im = im.convert("1", dither=Image.FLOYDSTEINBERG)
+                    im = PIL.ImageOps.invert(im)
+                    # Pillow's Floyd-Steinberg runs in C on the greyscale data and directly yields the 1-bit image
+                    im = im.convert("1", dither=Image.Dither.FLOYDSTEINBERG)
                 else:
-                    im = im.point(lambda x: 0 if x < label_options.threshold else 255, mode="1")
-
-            self.data = add_status_information(self.data)
-            tape_size = label.tape_size
-            if label.form_factor in (FormFactor.DIE_CUT, FormFactor.ROUND_DIE_CUT):
-                self.mtype = 0x0B
-                self.mwidth = tape_size[0]
-                self.mlength = tape_size[1]
-            elif label.form_factor in (FormFactor.ENDLESS,):
-                self.mtype = 0x0A
-                self.mwidth = tape_size[0]
-                self.mlength = 0
-            elif label.form_factor in (FormFactor.PTOUCH_ENDLESS,):
-                self.mtype = 0x00
-                self.mwidth = tape_size[0]
-                self.mlength = 0
-            self.pquality = int(label_options.hq)
-            self.data = self.add_media_and_quality(self.data, im.size[1])
-            try:
-                if label_options.cut:
+                    # invert and threshold in a single pass
+                    im = im.point(threshold_lut, mode="1")
+                red_im = None
+            return im, red_im
+
+        # any iterable of images is accepted, e.g. a generator
+        images = list(images)
+        if len(images) > 1:
+            # Pillow releases the GIL for its image operations, so several images are prepared concurrently.
+            # The instructions are still generated in the order of the images.
+            executor = ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1))
+            prepared = executor.map(prepare, images)
+        else:
+            # a single image gains nothing from a thread pool
+            executor = None
+            prepared = map(prepare, images)
+        try:
+            for im, red_im in prepared:
+                self.data = add_status_information(self.data)
+                if is_die_cut:
+                    self.mtype = 0x0B
+                    self.mwidth = tape_size[0]
+                    self.mlength = tape_size[1]
+                elif form_factor == FormFactor.ENDLESS:
+                    self.mtype = 0x0A
+                    self.mwidth = tape_size[0]
+                    self.mlength = 0
+                elif form_factor == FormFactor.PTOUCH_ENDLESS:
+                    self.mtype = 0x00
+                    self.mwidth = tape_size[0]
+                    self.mlength = 0
+                self.pquality = int(label_options.hq)
+                self.data = self.add_media_and_quality(self.data, im.size[1])
+                if label_options.cut and self.model.cutting:
                     self.data = self.add_autocut(self.data, True)
                     self.data = self.add_cut_every(self.data, 1)
-            except BrotherQLUnsupportedCmd:
-                pass
-            try:
                 self.dpi_600 = label_options.dpi_600
                 self.cut_at_end = label_options.cut
                 self.two_color_printing = True if label_options.red else False
-                self.data = self.add_expanded_mode(self.data)
-            except BrotherQLUnsupportedCmd:
-                pass
-            self.data = add_margins(self.data, label.feed_margin)
-            try:
-                if label_options.compress:
+                if self.model.expanded_mode:
+                    self.data = self.add_expanded_mode(self.data)
+                self.data = add_margins(self.data, feed_margin)
+                if label_options.compress and self.model.compression:
                     self.data = self.add_compression(self.data, True)
-            except BrotherQLUnsupportedCmd:
-                pass
-            if label_options.red:
-                self.data = self.add_raster_data(self.data, black_im, red_im)
-            else:
-                self.data = self.add_raster_data(self.data, im)
-            self.data = add_print(self.data)
+                self.data = self.add_raster_data(self.data, im, red_im)
+                self.data = add_print(self.data)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
-        return self.data
+        return bytes(self.data)
@@ -1,15 +1,21 @@
+import contextlib
 import io
 import logging
+import mmap
 import struct
 
 from PIL import Image
-from PIL.ImageOps import colorize
+from PIL.ImageOps import colorize, invert
 
-from .control.op_codes import OPCODES, match_opcode
+from .control.op_codes import OpCode, match_opcode, match_opcode_at
 from .utils.hex import hex_format
+from .utils.run_length import unpack_bits
 
 logger = logging.getLogger(__name__)
 
+_UINT16 = struct.Struct("<H")  # length of a P-touch raster line
+_UINT32 = struct.Struct("<L")  # raster number of the media/quality command
+
 
 def chunker(data: bytes, raise_exception: bool = False):
     """
@@ -19,38 +25,103 @@ def chunker(data: bytes, raise_exception: bool = False):
 
     returns: list of bytes objects
     """
-    instructions = []
-    data = bytes(data)
+    for _, instruction in chunk_instructions(data, raise_exception):
+        yield instruction
+
+
+# enough bytes to match the longest signature and to read the length of a raster line behind it
+_INSTRUCTION_HEAD = 8
+
+
+def _instruction_length(opcode: OpCode, data: bytes | memoryview, pos: int) -> int:
+    """The length of the instruction starting with `opcode` at position `pos` of the data, including the signature"""
+    num_bytes = len(opcode.signature)
+    if opcode.following_bytes > 0:
+        num_bytes += opcode.following_bytes
+    elif opcode.name in ("raster QL", "2-color raster QL"):
+        num_bytes += data[pos + 2] + 2
+    elif opcode.name in ("raster P-touch",):
+        num_bytes += _UINT16.unpack_from(data, pos + 1)[0] + 2
+    return num_bytes
+
+
+def chunk_instructions(data: bytes, raise_exception: bool = False):
+    """
+    Like :py:func:`chunker`, but yields each instruction together with the OpCode it was identified by,
+    so that consumers don't have to match it again.
+
+    returns: (OpCode, bytes) tuples
+    """
+    # a view of the data, indexed with a cursor so that advancing past each instruction neither copies the rest nor creates new views.
+    # The views are released once the iteration ends (or the generator is closed), so that e.g. a mmap can be closed afterwards.
+    with memoryview(data) as view, view.cast("B") as data:
+        pos = 0
+        while pos < len(data):
+            try:
+                opcode = match_opcode_at(data, pos)
+            except:
+                msg = "unknown opcode starting with {}...)".format(hex_format(data[pos : pos + 4]))
+                if raise_exception:
+                    raise ValueError(msg)
+                else:
+                    logger.warning(msg)
+                    pos += 1
+                    continue
+
+            num_bytes = _instruction_length(opcode, data, pos)
+
+            yield opcode, bytes(data[pos : pos + num_bytes])
+
+            pos += num_bytes
+
+
+def stream_instructions(stream, raise_exception: bool = False, read_size: int = 64 * 1024):
+    """
+    Like :py:func:`chunk_instructions`, but reads the instructions from a binary file-like object as they are needed,
+    so that only a window of `read_size` bytes and the current instruction are kept in memory.
+
+    returns: (OpCode, bytes) tuples
+    """
+    buffer = bytearray()
+    pos = 0
+    eof = False
+
+    def fill(size: int) -> None:
+        """Read until `size` bytes from `pos` on are buffered or the end of the stream is reached"""
+        nonlocal buffer, pos, eof
+        if pos >= read_size:
+            # drop what has already been consumed
+            del buffer[:pos]
+            pos = 0
+        while not eof and len(buffer) - pos < size:
+            block = stream.read(max(read_size, size - (len(buffer) - pos)))
+            if block:
+                buffer += block
+            else:
+                eof = True
+
     while True:
-        if len(data) == 0:
+        fill(_INSTRUCTION_HEAD)
+        if pos >= len(buffer):
             break
 
         try:
-            opcode = match_opcode(data)
+            opcode = match_opcode_at(buffer, pos)
         except:
-            msg = "unknown opcode starting with {}...)".format(hex_format(data[0:4]))
+            msg = "unknown opcode starting with {}...)".format(hex_format(buffer[pos : pos + 4]))
             if raise_exception:
                 raise ValueError(msg)
             else:
                 logger.warning(msg)
-                data = data[1:]
+                pos += 1
                 continue
 
-        num_bytes = len(opcode.signature)
-        if opcode.following_bytes > 0:
-            num_bytes += opcode.following_bytes
-        elif opcode.name in ("raster QL", "2-color raster QL"):
-            num_bytes += data[2] + 2
-        elif opcode.name in ("raster P-touch",):
-            num_bytes += data[1] + data[2] * 256 + 2
+        num_bytes = _instruction_length(opcode, buffer, pos)
+        fill(num_bytes)
 
-        # payload = data[len(opcode):num_bytes]
-        instructions.append(data[:num_bytes])
+        yield opcode, bytes(buffer[pos : pos + num_bytes])
 
-        yield instructions[-1]
-
-        data = data[num_bytes:]
-    # return instructions
+        pos += num_bytes
 
 
 def merge_specific_instructions(chunks: list, join_preamble: bool = True, join_raster: bool = True) -> list:
@@ -93,106 +164,120 @@ class BrotherQLReader:
         self.cut_at_end = False
         self.high_resolution_printing = False
         self.filename_fmt = self.DEFAULT_FILENAME_FMT
+        # opcode name -> method handling the instruction, opcodes without a handler are only logged
+        self._handlers = {
+            "init": self._handle_init,
+            "compression": self._handle_compression,
+            "zero raster": self._handle_zero_raster,
+            "raster QL": self._handle_raster,
+            "2-color raster QL": self._handle_raster,
+            "raster P-touch": self._handle_raster,
+            "expanded": self._handle_expanded,
+            "media/quality": self._handle_media_quality,
+            "print": self._handle_print,
+        }
 
     def analyse(self) -> None:
-        instructions = self.brother_file.read()
-        for instruction in chunker(instructions):
-            for opcode in OPCODES:
-                if instruction.startswith(opcode.signature):
-                    if opcode.name == "init":
-                        self.mwidth, self.mheight = None, None
-                        self.raster_no = None
-                        self.black_rows = []
-                        self.red_rows = []
-                    payload = instruction[len(opcode) :]
-                    logger.info(" {} ({}) --> found! (payload: {})".format(opcode.name, hex_format(opcode), hex_format(payload)))
-                    if opcode.name == "compression":
-                        self.compression = payload[0] == 0x02
-                    if opcode.name == "zero raster":
-                        self.black_rows.append(bytes())
-                        if self.two_color_printing:
-                            self.red_rows.append(bytes())
-                    if opcode.name in ("raster QL", "2-color raster QL", "raster P-touch"):
-                        rpl = bytes(payload[2:])  # raster payload
-                        if self.compression:
-                            row = bytes()
-                            index = 0
-                            while True:
-                                num = rpl[index]
-                                if num & 0x80:
-                                    num = num - 0x100
-                                if num < 0:
-                                    num = -num + 1
-                                    row += bytes([rpl[index + 1]] * num)
-                                    index += 2
-                                else:
-                                    num = num + 1
-                                    row += rpl[index + 1 : index + 1 + num]
-                                    index += 1 + num
-                                if index >= len(rpl):
-                                    break
-                        else:
-                            row = rpl
-                        if opcode.name in ("raster QL", "raster P-touch"):
-                            self.black_rows.append(row)
-                        else:  # 2-color
-                            if payload[0] == 0x01:
-                                self.black_rows.append(row)
-                            elif payload[0] == 0x02:
-                                self.red_rows.append(row)
-                            else:
-                                raise NotImplementedError("color: 0x%x" % payload[0])
-                    if opcode.name == "expanded":
-                        self.two_color_printing = bool(payload[0] & (1 << 0))
-                        self.cut_at_end = bool(payload[0] & (1 << 3))
-                        self.high_resolution_printing = bool(payload[0] & (1 << 6))
-                    if opcode.name == "media/quality":
-                        self.raster_no = struct.unpack("<L", payload[4:8])[0]
-                        self.mwidth = instruction[len(opcode) + 2]
-                        self.mlength = instruction[len(opcode) + 3] * 256
-                        fmt = " media width: {} mm, media length: {} mm, raster no: {} rows"
-                        logger.info(fmt.format(self.mwidth, self.mlength, self.raster_no))
-                    if opcode.name == "print":
-                        logger.info("Len of black rows: %d", len(self.black_rows))
-                        logger.info("Len of red   rows: %d", len(self.red_rows))
-
-                        def get_im(rows):
-                            if not len(rows):
-                                return None
-                            width_dots = max(len(row) for row in rows)
-                            height_dots = len(rows)
-                            size = (width_dots * 8, height_dots)
-                            expanded_rows = []
-                            for row in rows:
-                                if len(row) == 0:
-                                    expanded_rows.append(b"\x00" * width_dots)
-                                else:
-                                    expanded_rows.append(row)
-                            data = bytes(b"".join(expanded_rows))
-                            data = bytes([2**8 + ~byte for byte in data])  # invert b/w
-                            im = Image.frombytes("1", size, data, decoder_name="raw")
-                            return im
-
-                        if not self.two_color_printing:
-                            im_black = get_im(self.black_rows)
-                            im = im_black
-                        else:
-                            im_black, im_red = (get_im(rows) for rows in (self.black_rows, self.red_rows))
-                            im_black = im_black.convert("RGBA")
-                            im_red = im_red.convert("L")
-                            im_red = colorize(im_red, (255, 0, 0), (255, 255, 255))
-                            im_red = im_red.convert("RGBA")
-                            pixdata_black = im_black.load()
-                            width, height = im_black.size
-                            for y in range(height):
-                                for x in range(width):
-                                    # replace "white" with "transparent"
-                                    if pixdata_black[x, y] == (255, 255, 255, 255):
-                                        pixdata_black[x, y] = (255, 255, 255, 0)
-                            im_red.paste(im_black, (0, 0), im_black)
-                            im = im_red
-                        im = im.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-                        img_name = self.filename_fmt.format(counter=self.page_counter)
-                        im.save(img_name)
-                        print("Page saved as {}".format(img_name))
-                        self.page_counter += 1
+        """
+        Goes through the instructions of the file and saves every printed page as an image.
+
+        Regular files are mapped into memory instead of reading a copy of all of it, other streams are read piece by piece.
+        """
+        try:
+            data = mmap.mmap(self.brother_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # no regular file (e.g. a pipe or an io.BytesIO) or an empty one
+            self._analyse_instructions(stream_instructions(self.brother_file))
+            return
+        # the instructions are closed before the map, which can't be closed while their view of it exists
+        with data, contextlib.closing(chunk_instructions(data)) as instructions:
+            self._analyse_instructions(instructions)
+
+    def _analyse_instructions(self, instructions) -> None:
+        for opcode, instruction in instructions:
+            payload = instruction[len(opcode.signature) :]
+            if logger.isEnabledFor(logging.INFO):
+                # hex dumps of every payload are costly, only build them if they are logged
+                logger.info(" {} ({}) --> found! (payload: {})".format(opcode.name, hex_format(opcode.signature), hex_format(payload)))
+            handler = self._handlers.get(opcode.name)
+            if handler is not None:
+                handler(opcode, payload, instruction)
+
+    def _handle_init(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        self.mwidth, self.mheight = None, None
+        self.raster_no = None
+        self.black_rows = []
+        self.red_rows = []
+
+    def _handle_compression(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        self.compression = payload[0] == 0x02
+
+    def _handle_zero_raster(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        self.black_rows.append(bytes())
+        if self.two_color_printing:
+            self.red_rows.append(bytes())
+
+    def _handle_raster(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        rpl = bytes(payload[2:])  # raster payload
+        if self.compression:
+            row = unpack_bits(rpl)
+        else:
+            row = rpl
+        if opcode.name in ("raster QL", "raster P-touch"):
+            self.black_rows.append(row)
+        else:  # 2-color
+            if payload[0] == 0x01:
+                self.black_rows.append(row)
+            elif payload[0] == 0x02:
+                self.red_rows.append(row)
+            else:
+                raise NotImplementedError("color: 0x%x" % payload[0])
+
+    def _handle_expanded(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        self.two_color_printing = bool(payload[0] & (1 << 0))
+        self.cut_at_end = bool(payload[0] & (1 << 3))
+        self.high_resolution_printing = bool(payload[0] & (1 << 6))
+
+    def _handle_media_quality(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        self.raster_no = _UINT32.unpack_from(payload, 4)[0]
+        self.mwidth = instruction[len(opcode.signature) + 2]
+        self.mlength = instruction[len(opcode.signature) + 3] * 256
+        fmt = " media width: {} mm, media length: {} mm, raster no: {} rows"
+        logger.info(fmt.format(self.mwidth, self.mlength, self.raster_no))
+
+    def _handle_print(self, opcode: OpCode, payload: bytes, instruction: bytes) -> None:
+        logger.info("Len of black rows: %d", len(self.black_rows))
+        logger.info("Len of red   rows: %d", len(self.red_rows))
+
+        def get_im(rows):
+            if not len(rows):
+                return None
+            width_dots = max(len(row) for row in rows)
+            height_dots = len(rows)
+            size = (width_dots * 8, height_dots)
+            # zero raster lines (empty rows) and the unsent end of short rows stay blank
+            data = bytearray(width_dots * height_dots)
+            for y, row in enumerate(rows):
+                if row:
+                    start = y * width_dots
+                    data[start : start + len(row)] = row
+            # the "1;I" raw mode inverts b/w while unpacking
+            im = Image.frombytes("1", size, data, "raw", "1;I")
+            return im
+
+        if not self.two_color_printing:
+            im_black = get_im(self.black_rows)
+            im = im_black
+        else:
+            im_black, im_red = (get_im(rows) for rows in (self.black_rows, self.red_rows))
+            im_red = im_red.convert("L")
+            im_red = colorize(im_red, (255, 0, 0), (255, 255, 255))
+            im_red = im_red.convert("RGBA")
+            # paint black over the red layer, the inverted black layer is the mask of its black pixels
+            im_red.paste((0, 0, 0, 255), None, invert(im_black.convert("L")))
+            im = im_red
+        im = im.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        img_name = self.filename_fmt.format(counter=self.page_counter)
+        im.save(img_name)
+        print("Page saved as {}".format(img_name))
+        self.page_counter += 1
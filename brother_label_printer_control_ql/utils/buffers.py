@@ -0,0 +1,26 @@
+# Upper bound for the number of buffers handed to a single vectored write (POSIX guarantees at least 16, Linux allows 1024)
+IOV_MAX = 1024
+
+
+def total_length(data: bytes | list[bytes]) -> int:
+    """Number of bytes in a buffer or a list of buffers."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data).nbytes
+    return sum(memoryview(part).nbytes for part in data)
+
+
+def as_views(parts: list[bytes]) -> list[memoryview]:
+    """Flat byte views of all non-empty buffers."""
+    return [memoryview(part).cast("B") for part in parts if len(part)]
+
+
+def consume(views: list[memoryview], n: int) -> list[memoryview]:
+    """Drop the first n bytes from a list of buffer views, e.g. after a partial vectored write."""
+    i = 0
+    while i < len(views) and n >= len(views[i]):
+        n -= len(views[i])
+        i += 1
+    views = views[i:]
+    if n:
+        views[0] = views[0][n:]
+    return views
@@ -1,9 +1,12 @@
-def hex_format_byte(byte: bytes) -> str:
-    try:
-        return "{:02X}".format(byte)
-    except ValueError:
-        return "{:02X}".format(ord(byte))
+def hex_format_byte(byte: int | bytes | str) -> str:
+    if not isinstance(byte, int):
+        # a single byte or character instead of the int that iterating over bytes yields
+        byte = ord(byte)
+    return f"{byte:02X}"
 
 
 def hex_format(data) -> str:
-    return " ".join(hex_format_byte(byte) for byte in data)
+    if isinstance(data, str):
+        return " ".join(hex_format_byte(byte) for byte in data)
+    # formats bytes, bytearrays, memoryviews and lists of ints in a single C call
+    return bytes(data).hex(" ").upper()
@@ -1,23 +1,32 @@
-from PIL import Image
+from PIL import Image, ImageChops
+
+# maps every non-zero value to 255
+_NONZERO = [0] + [255] * 255
+
+
+def hsv_bands(im: Image) -> tuple[Image, Image, Image]:
+    """The H, S and V bands of `im`, to share one conversion between several calls of `hsv_mask()`"""
+    return im.convert("HSV").split()
 
 
 def filtered_hsv(im: Image, filter_h, filter_s, filter_v, default_col=(255, 255, 255)) -> Image:
-    """https://stackoverflow.com/a/22237709/183995"""
-    hsv_im = im.convert("HSV")
+    """
+    https://stackoverflow.com/a/22237709/183995
+
+    The filters are applied to the H, S and V bands with `Image.point()`, so they can be functions or lookup tables.
+    Keeps the pixels of `im` for which all three filters yield a non-zero value and sets the others to `default_col`.
+    """
+    filtered_im = Image.new("RGB", im.size, color=default_col)
+    filtered_im.paste(im, None, hsv_mask(hsv_bands(im), filter_h, filter_s, filter_v))
+    return filtered_im
 
+
+def hsv_mask(hsv: tuple[Image, Image, Image], filter_h, filter_s, filter_v) -> Image:
+    """Mask that is 255 where all three filters yield a non-zero value for the bands from `hsv_bands()`, and 0 elsewhere."""
     H, S, V = 0, 1, 2
-    hsv = hsv_im.split()
     mask_h = hsv[H].point(filter_h)
     mask_s = hsv[S].point(filter_s)
     mask_v = hsv[V].point(filter_v)
 
-    Mdat = []
-    for h, s, v in zip(mask_h.getdata(), mask_s.getdata(), mask_v.getdata()):
-        Mdat.append(255 if (h and s and v) else 0)
-
-    mask = mask_h
-    mask.putdata(Mdat)
-
-    filtered_im = Image.new("RGB", im.size, color=default_col)
-    filtered_im.paste(im, None, mask)
-    return filtered_im
+    # The minimum of the three masks is non-zero exactly where all of them are
+    return ImageChops.darker(ImageChops.darker(mask_h, mask_s), mask_v).point(_NONZERO)
@@ -6,11 +6,11 @@ logger = logging.getLogger(__name__)
 
 
 def textual_label_description(labels_to_include: list[Label]) -> str:
-    output = "Supported label sizes:\n"
-    output += ""
     fmt = " {label_size:9s} {dots_printable:14s} {label_descr:26s}\n"
-    output += fmt.format(label_size="Name", dots_printable="Printable px", label_descr="Description")
-    # output += fmt.format(label_size="", dots_printable="width x height", label_descr="")
+    # the lines are collected and joined once instead of growing the output string line by line
+    lines = ["Supported label sizes:\n"]
+    lines.append(fmt.format(label_size="Name", dots_printable="Printable px", label_descr="Description"))
+    # lines.append(fmt.format(label_size="", dots_printable="width x height", label_descr=""))
     for label in labels_to_include:
         if label.form_factor in (FormFactor.DIE_CUT, FormFactor.ROUND_DIE_CUT):
             dp_fmt = "{0:4d} x {1:4d}"
@@ -20,8 +20,8 @@ def textual_label_description(labels_to_include: list[Label]) -> str:
             dp_fmt = " - unknown - "
         dots_printable = dp_fmt.format(*label.dots_printable)
         label_descr = label.identifier
-        output += fmt.format(label_size=label.identifier, dots_printable=dots_printable, label_descr=label_descr)
-    return output
+        lines.append(fmt.format(label_size=label.identifier, dots_printable=dots_printable, label_descr=label_descr))
+    return "".join(lines)
 
 
 def log_discovered_devices(available_devices: list[str], level=logging.INFO) -> None:
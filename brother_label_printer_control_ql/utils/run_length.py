@@ -0,0 +1,62 @@
+import re
+
+# two or more identical bytes in a row
+_RUN = re.compile(rb"(.)\1+", re.DOTALL)
+
+
+def _pack_literal(out: bytearray, data: bytes, start: int, end: int, last: bool) -> None:
+    while end - start > 127 and not (last and end - start == 128):
+        out.append(126)
+        out += data[start : start + 127]
+        start += 127
+    if end > start:
+        out.append(end - start - 1)
+        out += data[start:end]
+
+
+def pack_bits(data: bytes) -> bytes:
+    """
+    PackBits compression of a raster line, with the same output as `packbits.encode()`.
+
+    The runs are found by a regular expression, so only the runs and the literal stretches in between
+    are handled in Python instead of each single byte.
+    """
+    out = bytearray()
+    pos = 0
+    for match in _RUN.finditer(data):
+        start, end = match.span()
+        _pack_literal(out, data, pos, start, last=False)
+        value = data[start : start + 1]
+        length = end - start
+        while length > 128:
+            out.append(130)  # 127 repetitions
+            out += value
+            length -= 127
+        out.append(257 - length)
+        out += value
+        pos = end
+    # packbits.encode() lets the final literal stretch grow to 128 bytes
+    _pack_literal(out, data, pos, len(data), last=True)
+    return bytes(out)
+
+
+def unpack_bits(data: bytes) -> bytes:
+    """
+    Decodes a PackBits compressed raster line.
+
+    Each control byte n is either followed by n + 1 literal bytes (0 <= n < 128)
+    or by a single byte to be repeated 257 - n times (n >= 128).
+    """
+    row = bytearray()
+    index = 0
+    length = len(data)
+    while index < length:
+        num = data[index]
+        if num & 0x80:
+            # slicing a single byte yields a bytes object that can be repeated at C speed
+            row += data[index + 1 : index + 2] * (257 - num)
+            index += 2
+        else:
+            row += data[index + 1 : index + 2 + num]
+            index += 2 + num
+    return bytes(row)